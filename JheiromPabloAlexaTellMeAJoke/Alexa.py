@@ -1,10 +1,23 @@
 import os
+import glob
+import json
+import mmap
 import random
+import struct
+import time
+import hashlib
+import threading
+from array import array
+from collections import deque
 import customtkinter as ctk
 import tkinter as tk
-from tkvideo import tkvideo
 from PIL import Image, ImageTk, ImageDraw, ImageFont
 
+try:
+    import imageio
+except ImportError:
+    imageio = None
+
 
 # Window Configuration
 
@@ -15,36 +28,162 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 JOKES_PATH = os.path.join(BASE_DIR, "randomJokes.txt")
 VIDEO_PATH = os.path.join(BASE_DIR, "Jheirom.mp4")
+FRAME_CACHE_DIR = os.path.join(BASE_DIR, ".frame_cache")
+SAMPLER_STATE_PATH = os.path.join(BASE_DIR, ".joke_sampler.json")
+
+# Background video: decoded frames buffered ahead of the display
+VIDEO_BUFFER_FRAMES = 8
+DEFAULT_VIDEO_FPS = 25
+
+# GIF delays below MIN_FRAME_DELAY_MS (often 0) are shown at DEFAULT_FRAME_DELAY_MS,
+# as browsers do
+MIN_FRAME_DELAY_MS = 20
+DEFAULT_FRAME_DELAY_MS = 100
 
 
 
 #  GIF Loader 
 
-class AnimatedGIF:
-    def __init__(self, path, size=(250, 100)):
-        self.frames = []
-        self.index = 0
+def read_gif_durations(path):
+    """Returns each frame's delay in ms by walking the GIF's blocks.
+
+    Only block headers are read, no pixel data is decoded, so this is far
+    cheaper than seeking through the frames with PIL. Returns None if the
+    file is not a GIF.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:3] != b"GIF":
+        return None
+
+    def skip_sub_blocks(pos):
+        while pos < len(data) and data[pos]:
+            pos += data[pos] + 1
+        return pos + 1
+
+    pos = 13
+    if data[10] & 0x80:  # Global colour table
+        pos += 3 * (2 << (data[10] & 7))
+    durations = []
+    delay = 0
+    while pos < len(data):
+        block = data[pos]
+        if block == 0x21:  # Extension; graphic control holds the next frame's delay
+            if data[pos + 1] == 0xF9 and data[pos + 2] >= 4:
+                delay = int.from_bytes(data[pos + 4:pos + 6], "little") * 10
+            pos = skip_sub_blocks(pos + 2)
+        elif block == 0x2C:  # Image descriptor, then optional local colour table and LZW data
+            flags = data[pos + 9]
+            pos += 10
+            if flags & 0x80:
+                pos += 3 * (2 << (flags & 7))
+            pos = skip_sub_blocks(pos + 1)
+            durations.append(delay)
+            delay = 0
+        else:  # Trailer (0x3B) or a damaged file
+            break
+    return durations
 
-        gif = Image.open(path)
-        self.is_gif = getattr(gif, "is_animated", False)
 
+class AnimatedGIF:
+    """GIF frames cropped and resized for a button, decoded only when first shown.
+
+    Prepared frames are stored as raw RGBA files in cache_dir, keyed on the
+    GIF's path, target size and modification time, so later launches skip
+    decoding and resampling altogether.
+    """
+
+    def __init__(self, path, size=(250, 100), cache_dir=FRAME_CACHE_DIR):
+        self.path = path
+        self.size = tuple(size)
+        self.cache_dir = cache_dir
+        self.gif = None  # Opened only when a frame is missing from the cache
+
+        stat = os.stat(path)
+        path_key = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:16]
+        self.cache_prefix = f"{path_key}-{self.size[0]}x{self.size[1]}"
+        file_key = hashlib.sha1(f"{stat.st_size}-{stat.st_mtime_ns}".encode()).hexdigest()[:16]
+        self.cache_key = f"{self.cache_prefix}-{file_key}"
+
+        info = self._read_info()
+        if info is None:
+            info = self._scan()
+        self.is_gif = info["is_gif"]
+        self.durations = info["durations"]
+        self.total_frames = len(self.durations)
+        self.frames = [None] * self.total_frames
+
+    def _cache_path(self, suffix):
+        return os.path.join(self.cache_dir, f"{self.cache_key}{suffix}")
+
+    def _read_info(self):
         try:
-            while True:
-                frame = gif.copy().convert("RGBA")
-
-                # Resize frame to rectangle (crop to fit)
-                frame = self.crop_to_fit(frame, size)
+            with open(self._cache_path(".json"), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _scan(self):
+        """Counts frames and reads their durations without decoding any pixels."""
+        durations = read_gif_durations(self.path)
+        if not durations:
+            # Not a GIF: other formats have to be seeked through with PIL
+            image = Image.open(self.path)
+            durations = []
+            for i in range(getattr(image, "n_frames", 1)):
+                image.seek(i)
+                durations.append(image.info.get("duration", 0))
+            image.close()
+        info = {"is_gif": len(durations) > 1, "durations": durations}
+
+        # Entries for an older version of this GIF at this size are now stale
+        for stale in glob.glob(os.path.join(glob.escape(self.cache_dir), glob.escape(self.cache_prefix) + "-*")):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+        self._write_cache(".json", json.dumps(info).encode())
+        return info
+
+    def _write_cache(self, suffix, data):
+        # The cache is only an optimisation; failing to write it is not an error
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            target = self._cache_path(suffix)
+            with open(target + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(target + ".tmp", target)
+        except OSError:
+            pass
 
-                # Convert to CTkImage for better HiDPI support
-                ctk_image = ctk.CTkImage(light_image=frame, dark_image=frame, size=size)
-                self.frames.append(ctk_image)
+    def _load_frame(self, i):
+        try:
+            with open(self._cache_path(f"-{i}.rgba"), "rb") as f:
+                data = f.read()
+            if len(data) == self.size[0] * self.size[1] * 4:
+                return Image.frombytes("RGBA", self.size, data)
+        except OSError:
+            pass
 
-                gif.seek(len(self.frames))
+        if self.gif is None:
+            self.gif = Image.open(self.path)
+        self.gif.seek(i)
+        frame = self.gif.convert("RGBA")
 
-        except EOFError:
-            pass
+        # Resize frame to rectangle (crop to fit)
+        frame = self.crop_to_fit(frame, self.size)
+        self._write_cache(f"-{i}.rgba", frame.tobytes())
+        return frame
 
-        self.total_frames = len(self.frames)
+    def frame(self, i):
+        if self.frames[i] is None:
+            frame = self._load_frame(i)
+            # Convert to CTkImage for better HiDPI support
+            self.frames[i] = ctk.CTkImage(light_image=frame, dark_image=frame, size=self.size)
+            if self.gif is not None and None not in self.frames:
+                self.gif.close()
+                self.gif = None
+        return self.frames[i]
 
     def crop_to_fit(self, image, target_size):
         """Crops image to fit target size while maintaining aspect ratio."""
@@ -69,40 +208,458 @@ class AnimatedGIF:
         # Resize to target size
         return image.resize(target_size, Image.LANCZOS)
 
-    def next(self):
-        frame = self.frames[self.index]
-        self.index = (self.index + 1) % self.total_frames
-        return frame
+    def duration(self, i):
+        """How long frame i stays on screen, in ms."""
+        delay = self.durations[i]
+        return delay if delay >= MIN_FRAME_DELAY_MS else DEFAULT_FRAME_DELAY_MS
+
+
+
+# Animation Scheduler
+
+class AnimationScheduler:
+    """Runs every animated widget from a single Tk timer.
+
+    Each widget advances on its own GIF's frame delays, and configure() is only
+    called for widgets whose frame changed. Static images are shown once and
+    never scheduled. The timer stops while the window is unmapped (minimised).
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.tracks = []  # [widget, gif, frame index, due time]
+        self.timer = None
+        self.paused = False
+        self.reset_stats()
+        root.bind("<Unmap>", self._on_unmap, add="+")
+        root.bind("<Map>", self._on_map, add="+")
+
+    def add(self, widget, gif):
+        widget.configure(image=gif.frame(0))
+        if gif.is_gif:
+            self.tracks.append([widget, gif, 0, time.perf_counter() + gif.duration(0) / 1000])
+            self._schedule()
+
+    def _schedule(self):
+        if self.timer is not None:
+            self.root.after_cancel(self.timer)
+            self.timer = None
+        if self.paused or not self.tracks:
+            return
+        wait = min(track[3] for track in self.tracks) - time.perf_counter()
+        self.timer = self.root.after(max(1, int(wait * 1000 + 0.5)), self._tick)
+
+    def _tick(self):
+        self.timer = None
+        start = time.perf_counter()
+        self.ticks += 1
+        for track in self.tracks:
+            widget, gif, index, due = track
+            if due > start:
+                continue
+            if start - due > 1:
+                # Far behind (the Tk loop was blocked): resync instead of catching up
+                due = start
+            # Skip frames we are late for instead of playing them back-to-back
+            while due <= start:
+                index = (index + 1) % gif.total_frames
+                due += gif.duration(index) / 1000
+            if index != track[2]:
+                widget.configure(image=gif.frame(index))
+                self.frames_shown += 1
+            track[2], track[3] = index, due
+        self.tick_seconds += time.perf_counter() - start
+        self._schedule()
+
+    def _on_unmap(self, event):
+        # Child widgets report Unmap to the toplevel's bindings too
+        if event.widget is self.root and not self.paused:
+            self.paused = True
+            self._schedule()
+
+    def _on_map(self, event):
+        if event.widget is self.root and self.paused:
+            self.paused = False
+            now = time.perf_counter()
+            for track in self.tracks:
+                track[3] = now + track[1].duration(track[2]) / 1000
+            self._schedule()
+
+    def stop(self):
+        self.paused = True
+        self._schedule()
+
+    def reset_stats(self):
+        self.ticks = 0
+        self.frames_shown = 0
+        self.tick_seconds = 0.0
+        self.stats_wall = time.perf_counter()
+        self.stats_cpu = time.process_time()
+
+    def stats(self):
+        """Frame-rate and CPU counters since the last reset_stats()."""
+        wall = max(time.perf_counter() - self.stats_wall, 1e-9)
+        return {
+            "seconds": wall,
+            "paused": self.paused,
+            "animated_widgets": len(self.tracks),
+            "ticks_per_s": self.ticks / wall,
+            "frames_per_s": self.frames_shown / wall,
+            "scheduler_cpu_percent": self.tick_seconds / wall * 100,
+            "process_cpu_percent": (time.process_time() - self.stats_cpu) / wall * 100,
+        }
 
 
 
 # Joke Loader
 
+FALLBACK_JOKES = [
+    ("Why don't scientists trust atoms?", "Because they make up everything."),
+    ("What do you call fake spaghetti?", "An impasta."),
+    ("Why did the scarecrow win an award?", "Because he was outstanding in his field."),
+    ("What happens if you boil a clown?", "You get a laughing stock."),
+    ("Why did the chicken cross the road?", "To get to the other side.")
+]
+
+# <corpus>.idx: header (magic, corpus size, corpus mtime, line count), then
+# one little-endian uint64 start offset per non-blank corpus line
+JOKES_INDEX_MAGIC = b"JIX1"
+JOKES_INDEX_HEADER = struct.Struct("<4sQqQ")
+
+
+def parse_joke(line):
+    line = line.strip()
+    if "?" in line:
+        s, p = line.split("?", 1)
+        return (s.strip() + "?", p.strip())
+    return (line, "")
+
+
+class JokeCorpus:
+    """The jokes file as a read-only sequence of (setup, punchline) tuples.
+
+    The corpus and its line-offset index are both memory-mapped, so opening it
+    costs the same for five jokes or five million, and jokes[i] parses only
+    line i. The index is rebuilt whenever the corpus size or mtime changes.
+    """
+
+    def __init__(self, path=JOKES_PATH):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.index_file = None
+        self.index_map = None
+
+        self.file = open(path, "rb")
+        stat = os.fstat(self.file.fileno())
+        # An empty file cannot be mapped
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+
+        self.offsets = self._open_index(stat)
+        if self.offsets is None:
+            self.offsets = self._build_index(stat)
+
+    def _open_index(self, stat):
+        try:
+            self.index_file = open(self.index_path, "rb")
+            size = os.fstat(self.index_file.fileno()).st_size
+            if size < JOKES_INDEX_HEADER.size:
+                return None
+            self.index_map = mmap.mmap(self.index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        magic, corpus_size, corpus_mtime, count = JOKES_INDEX_HEADER.unpack_from(self.index_map)
+        if (magic != JOKES_INDEX_MAGIC or (corpus_size, corpus_mtime) != (stat.st_size, stat.st_mtime_ns)
+                or size != JOKES_INDEX_HEADER.size + 8 * count):
+            return None
+        return memoryview(self.index_map)[JOKES_INDEX_HEADER.size:].cast("Q")
+
+    def _build_index(self, stat):
+        """Scans the corpus once for line starts and saves them beside it."""
+        self._close_index()
+        data = self.data
+        offsets = array("Q")
+        start = 0
+        while start < len(data):
+            end = data.find(b"\n", start)
+            if end == -1:
+                end = len(data)
+            if data[start:end].strip():
+                offsets.append(start)
+            start = end + 1
+
+        # A read-only folder just means the index is rebuilt next time
+        try:
+            with open(self.index_path + ".tmp", "wb") as f:
+                f.write(JOKES_INDEX_HEADER.pack(JOKES_INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, len(offsets)))
+                f.write(offsets.tobytes())
+            os.replace(self.index_path + ".tmp", self.index_path)
+        except OSError:
+            pass
+        return offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self.offsets)
+        start = self.offsets[i]
+        end = self.data.find(b"\n", start)
+        if end == -1:
+            end = len(self.data)
+        return parse_joke(self.data[start:end].decode("utf-8", errors="replace"))
+
+    def _close_index(self):
+        if isinstance(getattr(self, "offsets", None), memoryview):
+            self.offsets.release()
+        if self.index_map is not None:
+            self.index_map.close()
+            self.index_map = None
+        if self.index_file is not None:
+            self.index_file.close()
+            self.index_file = None
+
+    def close(self):
+        self._close_index()
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+
 def load_jokes(path=JOKES_PATH):
-    jokes = []
+    """Opens the corpus, or falls back to the built-in jokes if it is missing or empty."""
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                if "?" in line:
-                    s, p = line.split("?", 1)
-                    jokes.append((s.strip() + "?", p.strip()))
-                else:
-                    jokes.append((line, ""))
-    except:
-        jokes = [
-            ("Why don't scientists trust atoms?", "Because they make up everything."),
-            ("What do you call fake spaghetti?", "An impasta."),
-            ("Why did the scarecrow win an award?", "Because he was outstanding in his field."),
-            ("What happens if you boil a clown?", "You get a laughing stock."),
-            ("Why did the chicken cross the road?", "To get to the other side.")
-        ]
-
+        jokes = JokeCorpus(path)
+    except OSError:
+        return FALLBACK_JOKES
+    if not len(jokes):
+        jokes.close()
+        return FALLBACK_JOKES
     return jokes
 
 
+# Joke Order
+
+MASK64 = (1 << 64) - 1
+
+
+class ShuffleBag:
+    """Hands out every index in range(size) once, in a shuffled order, before repeating.
+
+    The order is a seeded Feistel permutation over the smallest power-of-four
+    range covering size, cycle-walked back into range(size). Nothing per joke
+    is stored: a draw costs a few integer rounds, and the whole state is the
+    seed and a cursor, so it can be saved and resumed for corpora of any size.
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, size, seed=None, cursor=0, last=None):
+        self.size = size
+        self.cursor = cursor
+        self.last = last  # Previous draw, so a new pass never starts with it
+        half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self.half_bits = half_bits
+        self.half_mask = (1 << half_bits) - 1
+        self._set_seed(random.getrandbits(64) if seed is None else seed)
+
+    def _set_seed(self, seed):
+        self.seed = seed
+        keys = random.Random(seed)
+        self.keys = [keys.getrandbits(64) for _ in range(self.ROUNDS)]
+
+    def _round(self, value, key):
+        # splitmix64 finaliser: every input bit affects every output bit
+        z = (value + key) & MASK64
+        z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9 & MASK64
+        z = (z ^ (z >> 27)) * 0x94D049BB133111EB & MASK64
+        return (z ^ (z >> 31)) & self.half_mask
+
+    def _permute(self, x):
+        left, right = x >> self.half_bits, x & self.half_mask
+        for key in self.keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self.half_bits) | right
+
+    def position(self, i):
+        """The index drawn at position i of the current pass."""
+        x = self._permute(i)
+        # The permuted range is up to 4x size; walk until back inside it
+        while x >= self.size:
+            x = self._permute(x)
+        return x
+
+    def draw(self):
+        if self.cursor >= self.size:
+            # Next pass in a fresh order, not starting with the joke just shown
+            self.cursor = 0
+            self._set_seed(random.getrandbits(64))
+            while self.size > 1 and self.position(0) == self.last:
+                self._set_seed(random.getrandbits(64))
+        self.last = self.position(self.cursor)
+        self.cursor += 1
+        return self.last
+
+    @classmethod
+    def load(cls, path, size):
+        """Resumes the saved order, or starts a new one if the corpus size changed."""
+        try:
+            with open(path, "r") as f:
+                state = json.load(f)
+            if state["size"] == size:
+                return cls(size, state["seed"], state["cursor"], state["last"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return cls(size)
+
+    def save(self, path):
+        state = {"size": self.size, "seed": self.seed, "cursor": self.cursor, "last": self.last}
+        try:
+            with open(path + ".tmp", "w") as f:
+                json.dump(state, f)
+            os.replace(path + ".tmp", path)
+        except OSError:
+            pass
+
+
+
+# Video Player
+
+class VideoPlayer:
+    """Loops a video in a Tk label without decoding on the Tk thread.
+
+    A worker thread decodes and resizes frames into a bounded ring buffer,
+    waiting while it is full. The Tk thread shows each frame at its
+    presentation time and drops frames whose time has passed. A frame that
+    is already late when decoded is dropped before its resize, so a slow
+    machine skips frames instead of falling behind. If reading frames from
+    the file is itself slower than real time, skipping cannot help, and the
+    clock is slowed to the decoder instead.
+    """
+
+    def __init__(self, root, label, path, size, buffer_frames=VIDEO_BUFFER_FRAMES):
+        self.root = root
+        self.label = label
+        self.path = path
+        self.size = tuple(size)
+        self.capacity = buffer_frames
+        self.frames = deque()  # (presentation time in s, PIL image)
+        self.lock = threading.Condition()
+        self.stopped = threading.Event()
+        self.clock_start = None  # perf_counter() at presentation time 0
+        self.timer = None
+        self.photo = None
+        self.fps = DEFAULT_VIDEO_FPS
+        self.read_seconds = 0.0  # Moving average time to read one frame
+        self.error = None
+
+        self.decoded = 0
+        self.shown = 0
+        self.dropped = 0
+        self.stats_start = time.perf_counter()
+        self.thread = threading.Thread(target=self._decode, daemon=True)
+
+    def play(self):
+        self.thread.start()
+        self._present()
+
+    def clock(self):
+        return None if self.clock_start is None else time.perf_counter() - self.clock_start
+
+    def _decode(self):
+        base = 0.0  # Presentation time of the current loop's first frame
+        try:
+            while not self.stopped.is_set():
+                reader = imageio.get_reader(self.path)
+                try:
+                    self.fps = reader.get_meta_data().get("fps") or DEFAULT_VIDEO_FPS
+                    count = 0
+                    read_start = time.perf_counter()
+                    for count, frame in enumerate(reader, 1):
+                        if self.stopped.is_set():
+                            return
+                        self.read_seconds += (time.perf_counter() - read_start - self.read_seconds) * 0.1
+                        pts = base + (count - 1) / self.fps
+                        self.decoded += 1
+                        now = self.clock()
+                        if now is not None and pts < now:
+                            if self.read_seconds < 1 / self.fps:
+                                # Already late: skip the resize as well as the display
+                                self.dropped += 1
+                                read_start = time.perf_counter()
+                                continue
+                            # Reading alone cannot keep up: show this frame now
+                            with self.lock:
+                                self.clock_start = time.perf_counter() - pts
+                        image = Image.fromarray(frame).resize(self.size, Image.BILINEAR)
+                        with self.lock:
+                            while len(self.frames) >= self.capacity and not self.stopped.is_set():
+                                self.lock.wait()
+                            self.frames.append((pts, image))
+                        read_start = time.perf_counter()
+                finally:
+                    reader.close()
+                if not count:
+                    return
+                base += count / self.fps
+        except Exception as e:
+            self.error = e
+            print("Video Error:", e)
+
+    def _present(self):
+        self.timer = None
+        if self.stopped.is_set():
+            return
+        frame = None
+        with self.lock:
+            if self.frames and self.clock_start is None:
+                # Start the clock when the first frame is ready, not when decoding began
+                self.clock_start = time.perf_counter() - self.frames[0][0]
+            now = self.clock()
+            while self.frames and self.frames[0][0] <= now:
+                if frame is not None:
+                    self.dropped += 1
+                frame = self.frames.popleft()[1]
+            next_pts = self.frames[0][0] if self.frames else None
+            self.lock.notify()
+
+        if frame is not None:
+            self.photo = ImageTk.PhotoImage(frame)
+            self.label.configure(image=self.photo)
+            self.shown += 1
+
+        if next_pts is not None:
+            wait = next_pts - self.clock()
+        else:
+            wait = 1 / self.fps
+        if self.thread.is_alive() or self.frames:
+            self.timer = self.root.after(max(1, int(wait * 1000)), self._present)
+
+    def stop(self):
+        self.stopped.set()
+        with self.lock:
+            self.lock.notify_all()
+        if self.timer is not None:
+            self.root.after_cancel(self.timer)
+            self.timer = None
+
+    def stats(self):
+        """Decode and display rates since the last reset_stats(), plus dropped frames."""
+        wall = max(time.perf_counter() - self.stats_start, 1e-9)
+        return {
+            "decode_fps": self.decoded / wall,
+            "shown_fps": self.shown / wall,
+            "dropped": self.dropped,
+            "buffered": len(self.frames),
+            "video_fps": self.fps,
+        }
+
+    def reset_stats(self):
+        self.decoded = self.shown = self.dropped = 0
+        self.stats_start = time.perf_counter()
+
+
+
 # Main App
 
 class AlexaJokeApp(ctk.CTk):
@@ -116,6 +673,7 @@ class AlexaJokeApp(ctk.CTk):
 
         # Load jokes
         self.jokes = load_jokes()
+        self.sampler = ShuffleBag.load(SAMPLER_STATE_PATH, len(self.jokes))
         self.current_joke = None
 
         # Load GIF buttons
@@ -130,8 +688,12 @@ class AlexaJokeApp(ctk.CTk):
         # Video background
         self._load_video()
 
-        # Animate GIF buttons
-        self.animate_buttons()
+        # Animate GIF buttons; F2 prints the animation counters
+        self.animator = AnimationScheduler(self)
+        for button, gif in ((self.tell_btn, self.btn_tell), (self.show_btn, self.btn_punch),
+                            (self.next_btn, self.btn_next), (self.quit_btn, self.btn_quit)):
+            self.animator.add(button, gif)
+        self.bind("<F2>", self.print_animation_stats)
 
  
     # UI Layout
@@ -177,7 +739,7 @@ class AlexaJokeApp(ctk.CTk):
 
         # Main buttons even spacing
         self.show_btn = ctk.CTkButton(self, fg_color="transparent",
-                                      text="", image=self.btn_punch.next(),
+                                      text="", image=self.btn_punch.frame(0),
                                       width=250, height=100,
                                       command=self.show_punchline,
                                       state="disabled",
@@ -185,14 +747,14 @@ class AlexaJokeApp(ctk.CTk):
         self.show_btn.place(x=main_spacing, y=button_y)
 
         self.tell_btn = ctk.CTkButton(self, fg_color="transparent",
-                                      text="", image=self.btn_tell.next(),
+                                      text="", image=self.btn_tell.frame(0),
                                       width=250, height=100,
                                       command=self.tell_joke,
                                       hover=False)
         self.tell_btn.place(x=main_spacing + button_width + main_spacing, y=button_y)
 
         self.next_btn = ctk.CTkButton(self, fg_color="transparent",
-                                      text="", image=self.btn_next.next(),
+                                      text="", image=self.btn_next.frame(0),
                                       width=250, height=100,
                                       command=self.next_joke,
                                       state="disabled",
@@ -201,7 +763,7 @@ class AlexaJokeApp(ctk.CTk):
 
         # Quit button - smaller, positioned to the right above next joke button
         self.quit_btn = ctk.CTkButton(self, fg_color="transparent",
-                                      text="", image=self.btn_quit.next(),
+                                      text="", image=self.btn_quit.frame(0),
                                       width=150, height=60,
                                       command=self.quit_app,
                                       hover=False)
@@ -211,40 +773,43 @@ class AlexaJokeApp(ctk.CTk):
     # Video Background
 
     def _load_video(self):
+        self.video_player = None
         try:
             if not os.path.exists(VIDEO_PATH):
                 return
+            if imageio is None:
+                raise ImportError("imageio is needed to play the background video")
 
             self.video_label = tk.Label(self)
             self.video_label.place(x=0, y=0, width=WINDOW_WIDTH, height=WINDOW_HEIGHT)
             self.video_label.lower()
 
-            self.video_player = tkvideo(
-                VIDEO_PATH,
-                self.video_label,
-                loop=1,
-                size=(WINDOW_WIDTH, WINDOW_HEIGHT)
-            )
+            self.video_player = VideoPlayer(self, self.video_label, VIDEO_PATH, (WINDOW_WIDTH, WINDOW_HEIGHT))
             self.video_player.play()
 
         except Exception as e:
             print("Video Error:", e)
 
 
-    # Animate Buttons
+    # Animation Counters
   
-    def animate_buttons(self):
-        self.tell_btn.configure(image=self.btn_tell.next())
-        self.show_btn.configure(image=self.btn_punch.next())
-        self.next_btn.configure(image=self.btn_next.next())
-        self.quit_btn.configure(image=self.btn_quit.next())
-        self.after(80, self.animate_buttons)
+    def print_animation_stats(self, event=None):
+        sources = [("Animation", self.animator)]
+        if self.video_player is not None:
+            sources.append(("Video", self.video_player))
+        for name, source in sources:
+            stats = source.stats()
+            print(f"{name}: " + ", ".join(
+                f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}" for key, value in stats.items()))
+            source.reset_stats()
 
 
     # Jokes
 
     def tell_joke(self):
-        self.current_joke = random.choice(self.jokes)
+        # Every joke comes up once before any repeats, across restarts too
+        self.current_joke = self.jokes[self.sampler.draw()]
+        self.sampler.save(SAMPLER_STATE_PATH)
         setup, _ = self.current_joke
         self.joke_text_label.configure(text=setup)
         self.punchline_label.place_forget()  # Hide punchline
@@ -261,6 +826,11 @@ class AlexaJokeApp(ctk.CTk):
         self.tell_joke()
 
     def quit_app(self):
+        self.animator.stop()
+        if self.video_player is not None:
+            self.video_player.stop()
+        if isinstance(self.jokes, JokeCorpus):
+            self.jokes.close()
         self.destroy()
 
 
@@ -1,121 +1,1565 @@
 import os
+import sys
+import csv
+import json
+import argparse
+import hashlib
+import locale
 import math
-import customtkinter as ctk
-import tkinter as tk
-from tkinter import messagebox, simpledialog
+import mmap
+import queue
+import sqlite3
+import struct
+import threading
+import multiprocessing
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+# The GUI toolkit and numpy are imported on first use (load_gui, load_numpy),
+# so scripts and the command line never pay for them or need a display
+ctk = tk = filedialog = messagebox = simpledialog = None
+np = None
+_numpy_checked = False
+
+def load_numpy():
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            pass
+    return np
+
+def load_gui():
+    global ctk, tk, filedialog, messagebox, simpledialog
+    if ctk is None:
+        import customtkinter
+        import tkinter
+        from tkinter import filedialog as file_dialogs, messagebox as message_boxes, simpledialog as input_dialogs
+        customtkinter.set_appearance_mode("Dark")
+        customtkinter.set_default_color_theme("blue")
+        ctk, tk = customtkinter, tkinter
+        filedialog, messagebox, simpledialog = file_dialogs, message_boxes, input_dialogs
 
 
 # Data classes
 
+GRADE_BOUNDARIES = (40, 50, 60, 70)
+GRADE_LETTERS = "FDCBA"
+
 class Student:
+    # Slots keep each record small; derived scores are computed once and
+    # cleared whenever a mark changes
+    __slots__ = ('student_code', 'name', '_mark1', '_mark2', '_mark3', '_exam_mark',
+                 '_total_coursework', '_overall_percentage', '_grade')
+
     def __init__(self, student_code, name, mark1, mark2, mark3, exam_mark):
         self.student_code = student_code
         self.name = name
-        self.mark1 = int(mark1)
-        self.mark2 = int(mark2)
-        self.mark3 = int(mark3)
-        self.exam_mark = int(exam_mark)
+        self._mark1 = int(mark1)
+        self._mark2 = int(mark2)
+        self._mark3 = int(mark3)
+        self._exam_mark = int(exam_mark)
+        self._overall_percentage = None
+
+    @property
+    def mark1(self):
+        return self._mark1
+
+    @mark1.setter
+    def mark1(self, value):
+        self._mark1 = int(value)
+        self._overall_percentage = None
+
+    @property
+    def mark2(self):
+        return self._mark2
+
+    @mark2.setter
+    def mark2(self, value):
+        self._mark2 = int(value)
+        self._overall_percentage = None
+
+    @property
+    def mark3(self):
+        return self._mark3
+
+    @mark3.setter
+    def mark3(self, value):
+        self._mark3 = int(value)
+        self._overall_percentage = None
+
+    @property
+    def exam_mark(self):
+        return self._exam_mark
+
+    @exam_mark.setter
+    def exam_mark(self, value):
+        self._exam_mark = int(value)
+        self._overall_percentage = None
+
+    def _derive(self):
+        total_coursework = self._mark1 + self._mark2 + self._mark3
+        percentage = ((total_coursework + self._exam_mark) / 160) * 100
+        self._total_coursework = total_coursework
+        self._grade = GRADE_LETTERS[bisect_right(GRADE_BOUNDARIES, percentage)]
+        self._overall_percentage = percentage
 
     @property
     def total_coursework(self):
-        return self.mark1 + self.mark2 + self.mark3
+        if self._overall_percentage is None:
+            self._derive()
+        return self._total_coursework
 
     @property
     def overall_percentage(self):
-        total_marks = self.total_coursework + self.exam_mark
-        return (total_marks / 160) * 100
+        if self._overall_percentage is None:
+            self._derive()
+        return self._overall_percentage
 
     @property
     def grade(self):
-        percentage = self.overall_percentage
-        if percentage >= 70:
-            return 'A'
-        elif percentage >= 60:
-            return 'B'
-        elif percentage >= 50:
-            return 'C'
-        elif percentage >= 40:
-            return 'D'
+        if self._overall_percentage is None:
+            self._derive()
+        return self._grade
+
+    def to_file_string(self):
+        return f"{self.student_code},{self.name},{self.mark1},{self.mark2},{self.mark3},{self.exam_mark}"
+
+# Columnar storage: one typed array per field instead of one object per student
+
+class StudentTable:
+    def __init__(self):
+        self.codes = []
+        self.names = []
+        # Plain ints rather than bytes: a file may hold out-of-range marks
+        # (negative, or over 255), and one such row must not fail the whole load
+        self.mark1 = array('i')
+        self.mark2 = array('i')
+        self.mark3 = array('i')
+        self.exam_mark = array('i')
+        # Derived columns, filled by compute() and kept current by set()
+        self.totals = array('i')
+        self.percentages = array('d')
+        self.grades = bytearray()
+        # 1 for live rows, 0 for deleted rows (rows are never shifted)
+        self.alive = bytearray()
+
+    def __len__(self):
+        return len(self.codes)
+
+    def append(self, student_code, name, mark1, mark2, mark3, exam_mark, compute=True):
+        self.codes.append(student_code)
+        self.names.append(name)
+        self.mark1.append(int(mark1))
+        self.mark2.append(int(mark2))
+        self.mark3.append(int(mark3))
+        self.exam_mark.append(int(exam_mark))
+        self.alive.append(1)
+        self.totals.append(0)
+        self.percentages.append(0.0)
+        self.grades.append(ord('F'))
+        row = len(self.codes) - 1
+        if compute:
+            self._compute_row(row)
+        return row
+
+    def extend(self, codes, names, mark1, mark2, mark3, exam_mark):
+        # Appends whole columns at once (derived columns are left for compute());
+        # returns the first new row number
+        first = len(self.codes)
+        count = len(codes)
+        self.codes.extend(codes)
+        self.names.extend(names)
+        for column, values in ((self.mark1, mark1), (self.mark2, mark2),
+                               (self.mark3, mark3), (self.exam_mark, exam_mark)):
+            column.extend(values)
+        self.alive.extend(b'\x01' * count)
+        self.totals.extend(array('i', bytes(self.totals.itemsize * count)))
+        self.percentages.extend(array('d', bytes(8 * count)))
+        self.grades.extend(b'F' * count)
+        return first
+
+    def delete(self, row):
+        self.alive[row] = 0
+
+    def set(self, row, field, value):
+        if field == 'student_code':
+            self.codes[row] = value
+        elif field == 'name':
+            self.names[row] = value
+        else:
+            getattr(self, field)[row] = int(value)
+            self._compute_row(row)
+
+    def _compute_row(self, row):
+        total = self.mark1[row] + self.mark2[row] + self.mark3[row] + self.exam_mark[row]
+        percentage = (total / 160) * 100
+        self.totals[row] = total
+        self.percentages[row] = percentage
+        self.grades[row] = ord(GRADE_LETTERS[bisect_right(GRADE_BOUNDARIES, percentage)])
+
+    def compute(self):
+        # Totals, percentages and grades for every row in one pass
+        np = load_numpy()
+        if np is not None and len(self):
+            totals = (np.frombuffer(self.mark1, dtype=np.intc)
+                      + np.frombuffer(self.mark2, dtype=np.intc)
+                      + np.frombuffer(self.mark3, dtype=np.intc)
+                      + np.frombuffer(self.exam_mark, dtype=np.intc))
+            percentages = (totals / 160) * 100
+            letters = np.frombuffer(GRADE_LETTERS.encode(), dtype=np.uint8)
+            grades = letters[np.searchsorted(GRADE_BOUNDARIES, percentages, side='right')]
+            self.totals = array('i', totals.tobytes())
+            self.percentages = array('d', percentages.tobytes())
+            self.grades = bytearray(grades.tobytes())
         else:
-            return 'F'
+            self.totals = array('i', map(sum, zip(self.mark1, self.mark2, self.mark3, self.exam_mark)))
+            self.percentages = array('d', [(total / 160) * 100 for total in self.totals])
+            letters = GRADE_LETTERS.encode()
+            self.grades = bytearray(letters[bisect_right(GRADE_BOUNDARIES, percentage)]
+                                    for percentage in self.percentages)
+
+    def row(self, row):
+        return StudentRow(self, row)
+
+
+class StudentRow:
+    # Student-compatible view onto one row of a StudentTable
+    __slots__ = ('table', 'row')
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    @property
+    def student_code(self):
+        return self.table.codes[self.row]
+
+    @property
+    def name(self):
+        return self.table.names[self.row]
+
+    @name.setter
+    def name(self, value):
+        self.table.set(self.row, 'name', value)
+
+    @property
+    def mark1(self):
+        return self.table.mark1[self.row]
+
+    @mark1.setter
+    def mark1(self, value):
+        self.table.set(self.row, 'mark1', value)
+
+    @property
+    def mark2(self):
+        return self.table.mark2[self.row]
+
+    @mark2.setter
+    def mark2(self, value):
+        self.table.set(self.row, 'mark2', value)
+
+    @property
+    def mark3(self):
+        return self.table.mark3[self.row]
+
+    @mark3.setter
+    def mark3(self, value):
+        self.table.set(self.row, 'mark3', value)
+
+    @property
+    def exam_mark(self):
+        return self.table.exam_mark[self.row]
+
+    @exam_mark.setter
+    def exam_mark(self, value):
+        self.table.set(self.row, 'exam_mark', value)
+
+    @property
+    def total_coursework(self):
+        return self.table.totals[self.row] - self.table.exam_mark[self.row]
+
+    @property
+    def overall_percentage(self):
+        return self.table.percentages[self.row]
+
+    @property
+    def grade(self):
+        return chr(self.table.grades[self.row])
 
     def to_file_string(self):
         return f"{self.student_code},{self.name},{self.mark1},{self.mark2},{self.mark3},{self.exam_mark}"
 
+
+# Best/worst scorers: students bucketed by overall percentage, with the
+# distinct percentages kept sorted. There are at most 161 distinct scores,
+# so updates and best/worst lookups never touch the whole cohort.
+
+class Leaderboard:
+    def __init__(self, students=()):
+        self._keys = []
+        self._buckets = {}
+        self.count = 0
+        for student in students:
+            self.add(student)
+
+    def add(self, student):
+        key = student.overall_percentage
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = {}
+            insort(self._keys, key)
+        bucket[student.student_code] = student
+        self.count += 1
+
+    def remove(self, student):
+        key = student.overall_percentage
+        bucket = self._buckets[key]
+        del bucket[student.student_code]
+        self.count -= 1
+        if not bucket:
+            del self._buckets[key]
+            self._keys.pop(bisect_left(self._keys, key))
+
+    def best(self):
+        if not self._keys:
+            return None
+        return next(iter(self._buckets[self._keys[-1]].values()))
+
+    def worst(self):
+        if not self._keys:
+            return None
+        return next(iter(self._buckets[self._keys[0]].values()))
+
+    def top(self, k):
+        result = []
+        for key in reversed(self._keys):
+            for student in self._buckets[key].values():
+                if len(result) == k:
+                    return result
+                result.append(student)
+        return result
+
+    def bottom(self, k):
+        result = []
+        for key in self._keys:
+            for student in self._buckets[key].values():
+                if len(result) == k:
+                    return result
+                result.append(student)
+        return result
+
+
+# Cohort statistics kept as running aggregates: a histogram of total marks
+# (at most 161 distinct values) plus per-component sums. Adding or removing a
+# student is O(1); medians and percentiles walk the histogram, never the cohort.
+
+STAT_PERCENTILES = (10, 25, 75, 90)
+COMPONENTS = ('mark1', 'mark2', 'mark3', 'exam_mark')
+
+def grade_for_total(total):
+    return GRADE_LETTERS[bisect_right(GRADE_BOUNDARIES, (total / 160) * 100)]
+
+class CohortStats:
+    def __init__(self, students=()):
+        self.count = 0
+        self.histogram = {}
+        self.grades = {letter: 0 for letter in reversed(GRADE_LETTERS)}
+        self.component_sums = [0, 0, 0, 0]
+        self.total_sum = 0
+        self.total_squares = 0
+        self.add_marks((student.mark1, student.mark2, student.mark3, student.exam_mark) for student in students)
+
+    @classmethod
+    def from_table(cls, table):
+        # Built from the live rows of a StudentTable's mark columns, without a
+        # StudentRow per row
+        stats = cls()
+        np = load_numpy()
+        columns = (table.mark1, table.mark2, table.mark3, table.exam_mark)
+        if np is None or not len(table):
+            stats.add_marks(marks for alive, *marks in zip(table.alive, *columns) if alive)
+            return stats
+        alive = np.frombuffer(table.alive, dtype=np.uint8).astype(bool)
+        columns = [np.frombuffer(column, dtype=np.intc)[alive].astype(np.int64) for column in columns]
+        totals, groups, counts = np.unique(sum(columns), return_inverse=True, return_counts=True)
+        sums = [np.bincount(groups, weights=column, minlength=len(totals)) for column in columns]
+        for i, total in enumerate(totals.tolist()):
+            stats.add_group(total, int(counts[i]), [int(column[i]) for column in sums])
+        return stats
+
+    def add_marks(self, rows):
+        # Adds many (mark1, mark2, mark3, exam_mark) rows with one add_group per distinct total
+        groups = {}
+        for marks in rows:
+            total = sum(marks)
+            group = groups.get(total)
+            if group is None:
+                groups[total] = [1, *marks]
+            else:
+                group[0] += 1
+                group[1] += marks[0]
+                group[2] += marks[1]
+                group[3] += marks[2]
+                group[4] += marks[3]
+        for total, (count, *component_sums) in groups.items():
+            self.add_group(total, count, component_sums)
+
+    def add_group(self, total, count, component_sums):
+        # count students with the same total; a negative count removes them
+        self.count += count
+        self.histogram[total] = self.histogram.get(total, 0) + count
+        if not self.histogram[total]:
+            del self.histogram[total]
+        self.grades[grade_for_total(total)] += count
+        for i, value in enumerate(component_sums):
+            self.component_sums[i] += value
+        self.total_sum += total * count
+        self.total_squares += total * total * count
+
+    def add(self, student):
+        marks = (student.mark1, student.mark2, student.mark3, student.exam_mark)
+        self.add_group(sum(marks), 1, marks)
+
+    def remove(self, student):
+        marks = (student.mark1, student.mark2, student.mark3, student.exam_mark)
+        self.add_group(sum(marks), -1, [-mark for mark in marks])
+
+    def percentile(self, p):
+        # Linear interpolation between closest ranks, as a percentage
+        if not self.count:
+            return None
+        position = (p / 100) * (self.count - 1)
+        lower, upper = int(position), min(int(position) + 1, self.count - 1)
+        values = {}
+        seen = 0
+        for total in sorted(self.histogram):
+            seen += self.histogram[total]
+            for rank in (lower, upper):
+                if rank not in values and rank < seen:
+                    values[rank] = total
+            if upper in values:
+                break
+        total = values[lower] + (values[upper] - values[lower]) * (position - lower)
+        return (total / 160) * 100
+
+    def summary(self):
+        if not self.count:
+            return {"count": 0}
+        mean_total = self.total_sum / self.count
+        variance = max(self.total_squares / self.count - mean_total ** 2, 0)
+        return {
+            "count": self.count,
+            "mean": (mean_total / 160) * 100,
+            "std_dev": (math.sqrt(variance) / 160) * 100,
+            "median": self.percentile(50),
+            "percentiles": {p: self.percentile(p) for p in STAT_PERCENTILES},
+            "grades": dict(self.grades),
+            "component_averages": {name: total / self.count
+                                   for name, total in zip(COMPONENTS, self.component_sums)},
+        }
+
+
+# Sorted views: one ascending (key, code) list per column, updated with
+# bisect on every edit. Descending order is the same list read backwards.
+
+SORT_COLUMNS = ('student_code', 'name', 'mark1', 'mark2', 'mark3', 'exam_mark',
+                'total_coursework', 'overall_percentage', 'grade')
+
+# The orderings offered by the Sort menu: choice -> (column, descending, title)
+SORT_ORDERS = {
+    "1": ("name", False, "Sorted by Name (A-Z)"),
+    "2": ("name", True, "Sorted by Name (Z-A)"),
+    "3": ("overall_percentage", True, "Sorted by Percentage (High-Low)"),
+    "4": ("overall_percentage", False, "Sorted by Percentage (Low-High)"),
+    "5": ("student_code", False, "Sorted by Student Code"),
+    "6": ("exam_mark", True, "Sorted by Exam Mark (High-Low)"),
+    "7": ("total_coursework", True, "Sorted by Coursework (High-Low)"),
+}
+
+class SortedView:
+    def __init__(self, column, students=()):
+        self.column = column
+        self._keys = sorted((getattr(student, column), student.student_code) for student in students)
+        self._cache = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, student):
+        insort(self._keys, (getattr(student, self.column), student.student_code))
+        self._cache.clear()
+
+    def remove(self, student):
+        key = (getattr(student, self.column), student.student_code)
+        self._keys.pop(bisect_left(self._keys, key))
+        self._cache.clear()
+
+    def codes(self, descending=False):
+        if descending:
+            return [code for _, code in reversed(self._keys)]
+        return [code for _, code in self._keys]
+
+    def students(self, index, descending=False):
+        # Materialised lists are cached until the next edit
+        cached = self._cache.get(descending)
+        if cached is None:
+            cached = self._cache[descending] = [index[code] for code in self.codes(descending)]
+        return cached
+
+
+# Name/code search: a trigram index (trigram -> codes) over each student's
+# lower-cased "name code" text. Substring queries intersect the postings of
+# the query's trigrams; typo-tolerant matches are the codes whose text holds
+# the largest share of the query's trigrams, so a misspelt surname on its own
+# still matches the full "name code" text.
+
+FUZZY_MIN_SIMILARITY = 0.5
+
+def trigrams(text, pad=True):
+    if pad:
+        text = f" {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class SearchIndex:
+    def __init__(self, students=()):
+        self._grams = {}
+        self._texts = {}
+        for student in students:
+            self.add(student)
+
+    def add(self, student):
+        code = student.student_code
+        text = f"{student.name.lower()} {code.lower()}"
+        self._texts[code] = text
+        for gram in trigrams(text):
+            self._grams.setdefault(gram, set()).add(code)
+
+    def remove(self, student):
+        text = self._texts.pop(student.student_code)
+        for gram in trigrams(text):
+            postings = self._grams[gram]
+            postings.discard(student.student_code)
+            if not postings:
+                del self._grams[gram]
+
+    def _substring_matches(self, query):
+        if len(query) >= 3:
+            postings = sorted((self._grams.get(gram, set()) for gram in trigrams(query, pad=False)), key=len)
+            candidates = set.intersection(*postings)
+        else:
+            # Too short for a trigram: take every trigram containing the query
+            candidates = set()
+            for gram, postings in self._grams.items():
+                if query in gram:
+                    candidates |= postings
+        return [code for code in candidates if query in self._texts[code]]
+
+    def _rank(self, code, query):
+        text = self._texts[code]
+        if code.lower() == query:
+            rank = 0
+        elif text.startswith(query) or f" {query}" in text:
+            rank = 1
+        else:
+            rank = 2
+        return rank, len(text), code
+
+    def _fuzzy_matches(self, query):
+        query_grams = trigrams(query)
+        shared = {}
+        for gram in query_grams:
+            for code in self._grams.get(gram, ()):
+                shared[code] = shared.get(code, 0) + 1
+        scored = []
+        for code, count in shared.items():
+            similarity = count / len(query_grams)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                scored.append((-similarity, code))
+        scored.sort()
+        return [code for _, code in scored]
+
+    def search(self, query, limit=None):
+        # Codes ranked: exact code, then name/word prefix, then substring, then
+        # fuzzy matches (only used to fill up when the exact ones run short)
+        query = query.strip().lower()
+        if not query:
+            return []
+        codes = sorted(self._substring_matches(query), key=lambda code: self._rank(code, query))
+        if limit is None and not codes or limit is not None and len(codes) < limit:
+            found = set(codes)
+            codes += [code for code in self._fuzzy_matches(query) if code not in found]
+        return codes if limit is None else codes[:limit]
+
+
+# Binary storage (.bin files)
+#   header:  magic, version, record size, count
+#   index:   count x (code, record number), sorted by code
+#   records: count x (code, name, mark1, mark2, mark3, exam_mark) in stored order
+# Every part is fixed-size, so a mapped file can be binary-searched in place.
+
+BINARY_MAGIC = b"SMB1"
+BINARY_VERSION = 2
+BINARY_HEADER = struct.Struct("<4sHHI")
+BINARY_CODE_BYTES = 16
+BINARY_NAME_BYTES = 48
+BINARY_INDEX_ENTRY = struct.Struct(f"<{BINARY_CODE_BYTES}sI")
+# Marks are signed 32-bit, as wide as a StudentTable column, so anything the
+# text loaders accept can be stored
+BINARY_RECORD = struct.Struct(f"<{BINARY_CODE_BYTES}s{BINARY_NAME_BYTES}s4i")
+BINARY_MARK_MIN, BINARY_MARK_MAX = -2 ** 31, 2 ** 31 - 1
+# Version 1 stored marks as unsigned bytes; those files are still readable
+BINARY_RECORDS = {
+    1: struct.Struct(f"<{BINARY_CODE_BYTES}s{BINARY_NAME_BYTES}s4B"),
+    BINARY_VERSION: BINARY_RECORD,
+}
+
+class BinaryStudentFile:
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{filename} is empty")
+        magic, version, record_size, self.count = BINARY_HEADER.unpack_from(self._map, 0)
+        self._record = BINARY_RECORDS.get(version)
+        if magic != BINARY_MAGIC or self._record is None or record_size != self._record.size:
+            self.close()
+            raise ValueError(f"{filename} is not a student binary file")
+        self._index_start = BINARY_HEADER.size
+        self._records_start = self._index_start + self.count * BINARY_INDEX_ENTRY.size
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def row(self, number):
+        code, name, mark1, mark2, mark3, exam_mark = self._record.unpack_from(
+            self._map, self._records_start + number * self._record.size)
+        return (code.rstrip(b"\0").decode(), name.rstrip(b"\0").decode(),
+                mark1, mark2, mark3, exam_mark)
+
+    def rows(self):
+        for number in range(self.count):
+            yield self.row(number)
+
+    def get_student_by_code(self, code):
+        # Binary search over the sorted index without reading the records
+        if len(code.encode()) > BINARY_CODE_BYTES:
+            return None
+        key = pack_field(code, BINARY_CODE_BYTES)
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            entry, number = BINARY_INDEX_ENTRY.unpack_from(
+                self._map, self._index_start + mid * BINARY_INDEX_ENTRY.size)
+            if entry < key:
+                low = mid + 1
+            elif entry > key:
+                high = mid
+            else:
+                return Student(*self.row(number))
+        return None
+
+
+def pack_field(text, size):
+    data = text.encode()
+    if len(data) > size:
+        raise ValueError(f"'{text}' is longer than {size} bytes")
+    return data.ljust(size, b"\0")
+
+
+def binary_field_error(student_code=None, name=None):
+    # Error message if a code or name will not fit a .bin record, else None
+    if student_code is not None and len(student_code.encode()) > BINARY_CODE_BYTES:
+        return f"Student code cannot be longer than {BINARY_CODE_BYTES} bytes"
+    if name is not None and len(name.encode()) > BINARY_NAME_BYTES:
+        return f"Name cannot be longer than {BINARY_NAME_BYTES} bytes"
+    return None
+
+
+def binary_student_error(student):
+    # Error message if a student cannot be stored in a .bin record, else None
+    error = binary_field_error(student.student_code, student.name)
+    marks = (student.mark1, student.mark2, student.mark3, student.exam_mark)
+    if error is None and not all(BINARY_MARK_MIN <= mark <= BINARY_MARK_MAX for mark in marks):
+        error = "Marks must fit in a 32-bit integer"
+    return error
+
+
+def binary_storable(students):
+    # Splits students into (those a .bin file can hold, [(row number, error), ...])
+    valid, errors = [], []
+    for number, student in enumerate(students, 1):
+        error = binary_student_error(student)
+        if error:
+            errors.append((number, error))
+        else:
+            valid.append(student)
+    return valid, errors
+
+
+def write_binary_students(filename, students):
+    # Writes to a temp file and renames it over filename. Raises ValueError,
+    # before touching any file, if a student does not fit (see binary_storable).
+    students = list(students)
+    for number, student in enumerate(students, 1):
+        error = binary_student_error(student)
+        if error:
+            raise ValueError(f"Student {student.student_code} (row {number}): {error}")
+    codes = [pack_field(student.student_code, BINARY_CODE_BYTES) for student in students]
+    order = sorted(range(len(students)), key=codes.__getitem__)
+    temp_filename = filename + ".tmp"
+    try:
+        with open(temp_filename, 'wb', buffering=READ_BUFFER_SIZE) as file:
+            file.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, BINARY_RECORD.size, len(students)))
+            for number in order:
+                file.write(BINARY_INDEX_ENTRY.pack(codes[number], number))
+            for code, student in zip(codes, students):
+                file.write(BINARY_RECORD.pack(code, pack_field(student.name, BINARY_NAME_BYTES), student.mark1,
+                                              student.mark2, student.mark3, student.exam_mark))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_filename, filename)
+    except BaseException:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
+
+
+READ_BUFFER_SIZE = 1024 * 1024
+# Text files smaller than this are always parsed in-process; below it, starting
+# the worker processes costs more than the parse
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+CHUNKS_PER_WORKER = 4
+PROGRESS_STEP = 10000
+# Shortest possible text row ("c,n,0,0,0,0\n"); caps how many rows a file's
+# header can claim
+MIN_ROW_BYTES = 12
+BULK_REBUILD_THRESHOLD = 1000
+
+def file_state(filename, size=None):
+    # (size, mtime_ns, header length, digest) for change detection, or None if
+    # the file is missing. The digest covers everything after the header line up
+    # to `size` bytes, so passing an older size checks whether the file still
+    # starts with exactly what was there before.
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    if size is None:
+        size = stat.st_size
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filename, 'rb') as file:
+        header_len = len(file.readline())
+        remaining = size - min(header_len, size)
+        file.seek(min(header_len, size))
+        while remaining > 0:
+            block = file.read(min(READ_BUFFER_SIZE, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return (size, stat.st_mtime_ns, header_len, digest.hexdigest())
+
+
+# Parallel text loading: the rows after the header are split into byte ranges
+# that begin and end on line boundaries, each range is parsed by a worker
+# process into compact columns, and the columns are joined back in file order.
+
+def line_chunks(filename, start, parts):
+    # Splits [start, end of file) into at most `parts` (start, end) byte ranges
+    size = os.path.getsize(filename)
+    bounds = [start]
+    with open(filename, 'rb') as file:
+        for i in range(1, parts):
+            offset = start + (size - start) * i // parts
+            if offset <= bounds[-1]:
+                continue
+            # Move forward to the start of the next line
+            file.seek(offset - 1)
+            file.readline()
+            offset = file.tell()
+            if offset >= size:
+                break
+            if offset > bounds[-1]:
+                bounds.append(offset)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def parse_chunk(filename, start, end, encoding):
+    # Worker half of a parallel load; returns (codes, names, mark1, mark2, mark3,
+    # exam_mark) with the marks as int arrays, which pickle as flat bytes
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        text = file.read(end - start).decode(encoding)
+    codes, names = [], []
+    marks = (array('i'), array('i'), array('i'), array('i'))
+    for line in text.split('\n'):
+        data = line.strip().split(',')
+        if len(data) == 6:
+            codes.append(data[0])
+            names.append(data[1])
+            for column, mark in zip(marks, data[2:]):
+                column.append(int(mark))
+    return (codes, names) + marks
+
+
+def normalize_row(data):
+    # The row as Student.to_file_string() would write it, so rows can be compared
+    # as text; raises ValueError for a mark that is not an integer
+    student_code, name, *marks = data
+    return [student_code, name] + [str(int(mark)) for mark in marks]
+
+
+def duplicate_codes(students):
+    seen = set()
+    duplicates = {}
+    for student in students:
+        code = student.student_code
+        if code in seen:
+            duplicates[code] = None
+        seen.add(code)
+    return list(duplicates)
+
+
+def validate_marks(mark1, mark2, mark3, exam_mark):
+    # Returns (marks, None) or (None, error message)
+    try:
+        marks = [int(mark1), int(mark2), int(mark3), int(exam_mark)]
+    except ValueError:
+        return None, "Invalid marks entered"
+    if any(m < 0 for m in marks):
+        return None, "Marks cannot be negative"
+    if marks[0] > 20 or marks[1] > 20 or marks[2] > 20:
+        return None, "Course marks must be between 0-20"
+    if marks[3] > 100:
+        return None, "Exam mark must be between 0-100"
+    return marks, None
+
+
+def validate_new_row(row, exists, seen):
+    # Checks one bulk_add row of (code, name, mark1, mark2, mark3, exam_mark);
+    # exists(code) tells whether the code is already stored and seen holds the
+    # codes accepted earlier in the batch. Returns ((code, name, marks), None)
+    # or (None, error message).
+    if len(row) != 6:
+        return None, "Expected 6 fields"
+    student_code, name = row[0].strip(), row[1].strip()
+    if not student_code or not name:
+        return None, "Student Code and Name are required"
+    if ',' in student_code or ',' in name:
+        return None, "Code and name cannot contain commas"
+    if exists(student_code):
+        return None, f"Student code {student_code} already exists"
+    if student_code in seen:
+        return None, f"Student code {student_code} appears twice in the import"
+    marks, error = validate_marks(*row[2:])
+    if error:
+        return None, error
+    return (student_code, name, marks), None
+
+
+UPDATE_FIELDS = {
+    'mark1': ("Course mark 1", 20),
+    'mark2': ("Course mark 2", 20),
+    'mark3': ("Course mark 3", 20),
+    'exam_mark': ("Exam mark", 100),
+}
+
+def validate_update(fields):
+    # Checks keyword updates for update_student; returns (clean fields, None)
+    # or (None, error message). Unknown fields are ignored.
+    clean = {}
+    if 'name' in fields:
+        clean['name'] = fields['name']
+    try:
+        for field, (label, limit) in UPDATE_FIELDS.items():
+            if field in fields:
+                mark = int(fields[field])
+                if mark < 0 or mark > limit:
+                    return None, f"{label} must be between 0-{limit}"
+                clean[field] = mark
+    except ValueError:
+        return None, "Invalid marks entered"
+    return clean, None
+
+
+class UpdateBatch:
+    # Applies many updates as one unit:
+    #     with manager.batch() as batch:
+    #         batch.update("1345", exam_mark=72)
+    # Every row is validated before anything changes; if any row fails nothing
+    # is applied and batch.errors lists (code, message). Indexes are refreshed
+    # and the data saved once, at commit.
+    def __init__(self, manager):
+        self.manager = manager
+        self.updates = {}
+        self.errors = []
+        self.committed = False
+
+    def __len__(self):
+        return len(self.updates)
+
+    def update(self, student_code, **fields):
+        self.updates.setdefault(student_code, {}).update(fields)
+
+    def commit(self, save=True):
+        validated = []
+        self.errors = []
+        for code, fields in self.updates.items():
+            student = self.manager.get_student_by_code(code)
+            if student is None:
+                self.errors.append((code, "Student not found"))
+                continue
+            clean, error = validate_update(fields)
+            if not error and getattr(self.manager, "binary", False):
+                error = binary_field_error(name=clean.get('name'))
+            if error:
+                self.errors.append((code, error))
+                continue
+            validated.append((student, clean))
+        if self.errors:
+            return False
+        self.manager._apply_updates(validated)
+        self.updates = {}
+        self.committed = self.manager.save_students() if save else True
+        return self.committed
+
+    def rollback(self):
+        self.updates = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+
+# Paged queries: query() returns one Page of a sorted, filtered and/or searched
+# result. Offsets index the full result, so next/prev_offset work as cursors.
+
+PAGE_SIZES = (25, 50, 100, 200)
+
+class Page:
+    def __init__(self, students, total, offset, limit):
+        self.students = students
+        self.total = total
+        self.offset = offset
+        self.limit = limit
+
+    @property
+    def next_offset(self):
+        return self.offset + self.limit if self.offset + self.limit < self.total else None
+
+    @property
+    def prev_offset(self):
+        return max(self.offset - self.limit, 0) if self.offset > 0 else None
+
+    @property
+    def number(self):
+        return self.offset // self.limit + 1
+
+    @property
+    def pages(self):
+        return max(1, math.ceil(self.total / self.limit))
+
+    def last_offset(self):
+        return (self.pages - 1) * self.limit
+
+
+def student_filter(grade=None, min_percentage=None, max_percentage=None):
+    # Predicate for query() filters, or None when nothing is filtered.
+    # grade is one letter or several ("AB"); percentage bounds are inclusive.
+    if grade is None and min_percentage is None and max_percentage is None:
+        return None
+    def matches(student):
+        percentage = student.overall_percentage
+        return ((grade is None or student.grade in grade)
+                and (min_percentage is None or percentage >= min_percentage)
+                and (max_percentage is None or percentage <= max_percentage))
+    return matches
+
+
 # Linking student marks text file
 class StudentManager:
-    def __init__(self, filename="JheiromPabloStudentManager/studentMarks.txt"):
+    def __init__(self, filename="JheiromPabloStudentManager/studentMarks.txt",
+                 journal=False, journal_limit=64 * 1024, columnar=False, autoload=True,
+                 workers=1):
         self.filename = filename
         base_dir = os.path.dirname(self.filename)
         if base_dir:
             os.makedirs(base_dir, exist_ok=True)
-        self.students = []
-        self.load_students()
+        # Files ending in .bin use the fixed-record binary format
+        self.binary = filename.endswith(".bin")
+        # Journal mode: edits are appended to <filename>.journal and folded
+        # back into the snapshot once the journal grows past journal_limit bytes
+        self.journal = journal
+        self.journal_filename = filename + ".journal"
+        self.journal_limit = journal_limit
+        self._pending = []
+        self._journal_size = 0
+        self._force_compact = False
+        self.last_error = None
+        # file_state() of the snapshot and journal as last read or written
+        self._file_state = None
+        self._journal_state = None
+        # Columnar mode keeps marks in a StudentTable and hands out StudentRow views
+        self.columnar = columnar
+        self.table = None
+        # Processes used to parse large text files: 1 parses in-process, 0 uses
+        # one per CPU (see PARALLEL_MIN_BYTES)
+        self.workers = workers
+        # Codes that appeared more than once in the last file read (the last row wins)
+        self.duplicate_codes = []
+        # code -> Student, kept in file order; the list view is rebuilt lazily
+        self._index = {}
+        self._students = []
+        self.leaderboard = Leaderboard()
+        self.stats = CohortStats()
+        # column -> SortedView, created on first use of that column
+        self._views = {}
+        # SearchIndex, created on the first search
+        self._search = None
+        # (query arguments, matching students) of the last filtered query(),
+        # dropped on every edit
+        self._query_cache = None
+        if autoload:
+            self.load_students()
 
-    def load_students(self):
-        self.students = []
+    @property
+    def students(self):
+        if self._students is None:
+            self._students = list(self._index.values())
+        return self._students
+
+    @students.setter
+    def students(self, students):
+        self._index = {student.student_code: student for student in students}
+        self._students = None
+        self._rebuild_indexes()
+
+    # Derived indexes, kept in step with self._index on every edit
+    def _rebuild_indexes(self):
+        self._query_cache = None
+        self.leaderboard = Leaderboard(self._index.values())
+        # The table's live rows are exactly the indexed students unless that
+        # invariant was broken, in which case fall back to walking the students
+        if self.table is not None and self.table.alive.count(1) == len(self._index):
+            self.stats = CohortStats.from_table(self.table)
+        else:
+            self.stats = CohortStats(self._index.values())
+        for column in self._views:
+            self._views[column] = SortedView(column, self._index.values())
+        if self._search is not None:
+            self._search = SearchIndex(self._index.values())
+
+    def _track(self, student):
+        self._query_cache = None
+        self.leaderboard.add(student)
+        self.stats.add(student)
+        for view in self._views.values():
+            view.add(student)
+        if self._search is not None:
+            self._search.add(student)
+
+    def _untrack(self, student):
+        self._query_cache = None
+        self.leaderboard.remove(student)
+        self.stats.remove(student)
+        for view in self._views.values():
+            view.remove(student)
+        if self._search is not None:
+            self._search.remove(student)
+
+    # Persistence. Each operation is split into a half that only touches files
+    # (safe to run on PersistenceWorker's thread) and a half that updates the
+    # in-memory state on the caller's thread. Errors are returned, not shown.
+    def load_students(self, progress=None):
+        self.install_students(self.read_students(progress))
+        return self.last_error is None
+
+    def read_students(self, progress=None):
+        # Streams the snapshot row by row and reads the journal without touching
+        # the manager; progress(loaded, expected) fires every PROGRESS_STEP rows
+        table = StudentTable() if self.columnar else None
         try:
             if not os.path.exists(self.filename):
-                with open(self.filename, 'w') as file:
-                    file.write("0\n")
-                return
-            with open(self.filename, 'r') as file:
-                lines = file.readlines()
-                if not lines:
-                    return
-                try:
-                    count = int(lines[0].strip())
-                except ValueError:
-                    count = 0
-                for line in lines[1:]:
-                    data = line.strip().split(',')
+                if self.binary:
+                    write_binary_students(self.filename, [])
+                else:
+                    with open(self.filename, 'w') as file:
+                        file.write("0\n")
+                return [], table, [], 0, self._current_states(), None
+            states = self._current_states()
+            if self.binary:
+                with BinaryStudentFile(self.filename) as source:
+                    records = self._load_rows(source.rows(), len(source), table, progress)
+            elif self._parallel_workers() > 1:
+                records = self._load_parallel(table, progress)
+            else:
+                with open(self.filename, 'r', buffering=READ_BUFFER_SIZE) as file:
+                    header = file.readline()
+                    try:
+                        count = max(int(header.strip()), 0)
+                    except ValueError:
+                        count = 0
+                    rows = (line.strip().split(',') for line in file)
+                    records = self._load_rows(rows, count, table, progress)
+            if table is not None:
+                table.compute()
+            journal_ops, journal_size = self._read_journal()
+            if progress:
+                progress(len(records), len(records))
+            return records, table, journal_ops, journal_size, states, None
+        except Exception as e:
+            return [], StudentTable() if self.columnar else None, [], 0, (None, None), str(e)
+
+    def install_students(self, loaded):
+        records, self.table, journal_ops, self._journal_size, states, self.last_error = loaded
+        self._file_state, self._journal_state = states
+        self._pending = []
+        self._force_compact = False
+        self._index = {student.student_code: student for student in records}
+        # Reuse the loaded list as the list view unless duplicates collapsed
+        self._students = records if len(self._index) == len(records) else None
+        self.duplicate_codes = [] if self._students is not None else duplicate_codes(records)
+        if self.duplicate_codes and self.table is not None:
+            # Rows shadowed by a later row with the same code are dead
+            for record in records:
+                if self._index[record.student_code] is not record:
+                    self.table.delete(record.row)
+        if journal_ops:
+            self._apply_journal(journal_ops)
+            self._students = None
+        self._rebuild_indexes()
+
+    def _current_states(self):
+        return file_state(self.filename), file_state(self.journal_filename)
+
+    def has_file_changed(self):
+        # Cheap stat-only check, suitable for polling
+        for filename, state in ((self.filename, self._file_state), (self.journal_filename, self._journal_state)):
+            try:
+                stat = os.stat(filename)
+                current = (stat.st_size, stat.st_mtime_ns)
+            except FileNotFoundError:
+                current = None
+            if current != (state[:2] if state else None):
+                return True
+        return False
+
+    # Incremental reload: nothing is parsed if the files are unchanged, only the
+    # new tail is parsed if rows were appended, and otherwise the fresh rows are
+    # diffed against memory so only changed students are replaced.
+    def reload_students(self, progress=None):
+        if self._pending:
+            self.save_students()
+        changed = self.install_changes(self.read_changes(progress))
+        return changed if self.last_error is None else None
+
+    def read_changes(self, progress=None):
+        # File half of reload_students. Rows are parsed and checked here, on the
+        # worker thread, so a bad row is reported as an error instead of raising
+        # on the caller's thread; "changed" rows already have the journal applied.
+        try:
+            old, old_journal = self._file_state, self._journal_state
+            new, new_journal = self._current_states()
+            if new == old and new_journal == old_journal:
+                return "unchanged", [], (new, new_journal), None
+            if (not self.binary and old and new and new_journal == old_journal
+                    and new[0] > old[0] and new[2] == old[2]
+                    and file_state(self.filename, old[0])[3] == old[3]):
+                rows = self._read_tail(old[0])
+                if rows is not None:
+                    return "appended", [normalize_row(data) for data in rows], (new, new_journal), None
+            if self.binary:
+                with BinaryStudentFile(self.filename) as source:
+                    rows = [list(map(str, row)) for row in source.rows()]
+            else:
+                with open(self.filename, 'r', buffering=READ_BUFFER_SIZE) as file:
+                    file.readline()
+                    rows = [data for data in (line.strip().split(',') for line in file) if len(data) == 6]
+            latest = {data[0]: normalize_row(data) for data in rows}
+            journal_ops, _ = self._read_journal()
+            for op, rest in journal_ops:
+                if op == "S":
+                    data = rest.split(',')
                     if len(data) == 6:
-                        student = Student(*data)
-                        self.students.append(student)
+                        latest[data[0]] = normalize_row(data)
+                elif op == "D":
+                    latest.pop(rest, None)
+            if progress:
+                progress(len(rows), len(rows))
+            return "changed", list(latest.values()), (new, new_journal), None
         except Exception as e:
-            messagebox.showerror("Error loading file", str(e))
+            return "error", [], None, str(e)
+
+    def _read_tail(self, offset):
+        # Rows after offset, or None if offset is not at a line boundary
+        with open(self.filename, 'rb') as file:
+            file.seek(offset - 1)
+            if file.read(1) != b"\n":
+                return None
+            tail = file.read().decode()
+        return [data for data in (line.strip().split(',') for line in tail.splitlines()) if len(data) == 6]
+
+    def install_changes(self, changes):
+        # Returns the number of students added, replaced or removed
+        kind, rows, states, self.last_error = changes
+        if self.last_error:
+            return 0
+        self._file_state, self._journal_state = states
+        self._journal_size = states[1][0] if states[1] else 0
+        if kind == "unchanged":
+            return 0
+        # Students edited since the files were read keep the in-memory version;
+        # their pending records will overwrite the file copy on the next save
+        unsaved = {record.split(',', 2)[1] for record in self._pending}
+        if kind == "appended":
+            return self._apply_changes([data for data in rows if data[0] not in unsaved], [])
+
+        latest = {data[0]: data for data in rows}
+        deletes = [code for code in self._index if code not in latest and code not in unsaved]
+        upserts = [data for code, data in latest.items() if code not in unsaved
+                   and (code not in self._index or ",".join(data) != self._index[code].to_file_string())]
+        return self._apply_changes(upserts, deletes)
+
+    def _apply_changes(self, upserts, deletes):
+        bulk = len(upserts) + len(deletes) > BULK_REBUILD_THRESHOLD
+        for code in deletes:
+            student = self._index.pop(code)
+            if not bulk:
+                self._untrack(student)
+            self._drop(student)
+        for data in upserts:
+            old = self._index.get(data[0])
+            if old is not None:
+                if not bulk:
+                    self._untrack(old)
+                self._drop(old)
+            student = self._make_student(*data)
+            self._index[data[0]] = student
+            if not bulk:
+                self._track(student)
+        if upserts or deletes:
+            self._students = None
+        if bulk:
+            self._rebuild_indexes()
+        return len(upserts) + len(deletes)
+
+    def _load_rows(self, rows, count, table, progress=None):
+        # Preallocate from the header count instead of growing the list row by
+        # row, but never more rows than the file could hold: a corrupt header
+        # must not allocate gigabytes
+        count = min(count, os.path.getsize(self.filename) // MIN_ROW_BYTES)
+        records = [None] * count
+        loaded = 0
+        for data in rows:
+            if len(data) == 6:
+                if table is None:
+                    student = Student(*data)
+                else:
+                    student = table.row(table.append(*data, compute=False))
+                if loaded < count:
+                    records[loaded] = student
+                else:
+                    records.append(student)
+                loaded += 1
+                if progress and loaded % PROGRESS_STEP == 0:
+                    progress(loaded, max(count, loaded))
+        del records[loaded:]
+        return records
+
+    def _parallel_workers(self):
+        workers = self.workers if self.workers else os.cpu_count() or 1
+        if workers <= 1 or self.binary or os.path.getsize(self.filename) < PARALLEL_MIN_BYTES:
+            return 1
+        return workers
+
+    def _load_parallel(self, table, progress=None):
+        with open(self.filename, 'rb') as file:
+            header = file.readline()
+        try:
+            count = max(int(header.strip()), 0)
+        except ValueError:
+            count = 0
+        workers = self._parallel_workers()
+        chunks = line_chunks(self.filename, len(header), workers * CHUNKS_PER_WORKER)
+        starts, ends = zip(*chunks)
+        records = []
+        # spawn, not fork: loads may run on PersistenceWorker's thread
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=context) as pool:
+            # map() yields chunk results in file order
+            for columns in pool.map(parse_chunk, repeat(self.filename), starts, ends,
+                                    repeat(locale.getpreferredencoding(False))):
+                if table is None:
+                    records.extend(map(Student, *columns))
+                else:
+                    first = table.extend(*columns)
+                    records.extend(map(table.row, range(first, len(table))))
+                if progress:
+                    progress(len(records), max(count, len(records)))
+        return records
 
     def save_students(self):
+        job = self.prepare_save()
+        error = self.write_save(job)
+        if error:
+            self.save_failed(job)
+        return error is None
+
+    def prepare_save(self):
+        # Takes what needs writing: pending journal records, plus a full snapshot
+        # when not journaling, when the journal is over its limit, or after a failure.
+        # A journaled snapshot still appends its records first (see _write_snapshot).
+        pending, self._pending = self._pending, []
+        self._journal_size += sum(len(record) + 1 for record in pending)
+        if not self.journal or self._force_compact or self._journal_size > self.journal_limit:
+            self._journal_size = 0
+            self._force_compact = False
+            return (pending if self.journal else []), list(self._index.values())
+        return pending, None
+
+    def write_save(self, job):
+        # File half of save_students; returns None or an error message
+        pending, snapshot = job
         try:
-            with open(self.filename, 'w') as file:
-                file.write(f"{len(self.students)}\n")
-                for student in self.students:
-                    file.write(student.to_file_string() + "\n")
-            return True
+            if pending:
+                self._append_journal(pending)
+            if snapshot is not None:
+                self._write_snapshot(snapshot)
+            # Our own writes should not look like outside changes. A journal-only
+            # save leaves the snapshot alone, so only the journal is re-read.
+            if snapshot is not None:
+                self._file_state, self._journal_state = self._current_states()
+            elif pending:
+                self._journal_state = file_state(self.journal_filename)
+            self.last_error = None
         except Exception as e:
-            messagebox.showerror("Error saving file", str(e))
-            return False
+            self.last_error = str(e)
+        return self.last_error
+
+    def save_failed(self, job):
+        # The records of the failed write go back in front of any newer ones, so
+        # the journal never misses an edit, and the next save rewrites the snapshot
+        self._pending[:0] = job[0]
+        self._force_compact = True
+
+    # Journal
+    def _record(self, op, student_code, student=None):
+        if student is None:
+            self._pending.append(f"{op},{student_code}")
+        else:
+            self._pending.append(f"{op},{student.to_file_string()}")
+
+    def _append_journal(self, records):
+        data = "".join(record + "\n" for record in records).encode(locale.getpreferredencoding(False))
+        with open(self.journal_filename, 'a+b') as file:
+            trim_torn_tail(file)
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _read_journal(self):
+        if not os.path.exists(self.journal_filename):
+            return [], 0
+        ops = []
+        with open(self.journal_filename, 'r') as file:
+            for line in file:
+                # A torn final line from a crash mid-append has no newline; skip it
+                if not line.endswith("\n"):
+                    break
+                op, _, rest = line.rstrip("\n").partition(',')
+                ops.append((op, rest))
+        return ops, os.path.getsize(self.journal_filename)
+
+    def _apply_journal(self, ops):
+        for op, rest in ops:
+            if op == "S":
+                data = rest.split(',')
+                if len(data) == 6:
+                    self._drop(self._index.get(data[0]))
+                    self._index[data[0]] = self._make_student(*data)
+            elif op == "D":
+                self._drop(self._index.pop(rest, None))
+
+    def _make_student(self, student_code, name, mark1, mark2, mark3, exam_mark):
+        if self.table is None:
+            return Student(student_code, name, mark1, mark2, mark3, exam_mark)
+        row = self.table.append(student_code, name, mark1, mark2, mark3, exam_mark)
+        return self.table.row(row)
+
+    def _drop(self, student):
+        if self.table is not None and student is not None:
+            self.table.delete(student.row)
+
+    def compact(self):
+        pending, self._pending = self._pending, []
+        if self.journal and pending:
+            self._append_journal(pending)
+        self._journal_size = 0
+        self._force_compact = False
+        self._write_snapshot(list(self._index.values()))
+        self._file_state, self._journal_state = self._current_states()
+
+    def _write_snapshot(self, students):
+        # Write the full snapshot to a temp file and rename it over the original,
+        # so a crash leaves either the old or the new file, never a partial one
+        if self.binary:
+            write_binary_students(self.filename, students)
+        else:
+            write_text_students(self.filename, students)
+        # Every edit is in the journal before the snapshot is written, so a crash
+        # before this point replays it over the new snapshot to the same state
+        if os.path.exists(self.journal_filename):
+            os.remove(self.journal_filename)
+
+    def __len__(self):
+        return len(self._index)
 
     def get_all_students(self):
         return self.students
 
+    def sorted_students(self, column, descending=False):
+        # Returns a cached list in the requested order; the stored order is never touched
+        if column not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {column}")
+        view = self._views.get(column)
+        if view is None:
+            view = self._views[column] = SortedView(column, self._index.values())
+        return view.students(self._index, descending)
+
+    def search_students(self, query, limit=None):
+        # Substring, prefix and typo-tolerant search over names and codes
+        if self._search is None:
+            self._search = SearchIndex(self._index.values())
+        return [self._index[code] for code in self._search.search(query, limit)]
+
+    def query(self, sort=None, descending=False, search=None, grade=None,
+              min_percentage=None, max_percentage=None, offset=0, limit=PAGE_SIZES[1]):
+        # One page of students. With no sort, search results keep their ranking
+        # and everything else keeps file order. Paging an unfiltered sort or the
+        # full list is a slice of a cached list; filtered results are cached
+        # until the next edit, so turning pages does not re-run the query.
+        offset = max(0, offset)
+        students = self._query_students(sort, descending, search, grade, min_percentage, max_percentage)
+        return Page(students[offset:offset + limit], len(students), offset, limit)
+
+    def _query_students(self, sort, descending, search, grade, min_percentage, max_percentage):
+        search = search.strip() if search else None
+        matches = student_filter(grade, min_percentage, max_percentage)
+        if not search and matches is None:
+            return self.sorted_students(sort, descending) if sort else self.students
+        key = (sort, descending, search, grade, min_percentage, max_percentage)
+        if self._query_cache is not None and self._query_cache[0] == key:
+            return self._query_cache[1]
+        if search:
+            found = self.search_students(search)
+            if sort:
+                codes = {student.student_code for student in found}
+                found = [student for student in self.sorted_students(sort, descending) if student.student_code in codes]
+        else:
+            found = self.sorted_students(sort, descending) if sort else self.students
+        if matches is not None:
+            found = [student for student in found if matches(student)]
+        self._query_cache = (key, found)
+        return found
+
     def get_student_by_code(self, code):
-        for student in self.students:
-            if student.student_code == code:
-                return student
-        return None
+        return self._index.get(code)
+
+    def _insert(self, student):
+        self._index[student.student_code] = student
+        if self._students is not None:
+            self._students.append(student)
+        self._record("S", student.student_code, student)
+
+    def _field_error(self, student_code=None, name=None):
+        # Only .bin files limit the length of codes and names
+        return binary_field_error(student_code, name) if self.binary else None
 
     def add_student(self, student_code, name, mark1, mark2, mark3, exam_mark):
-        if self.get_student_by_code(student_code):
+        if student_code in self._index:
             return False, "Student code already exists"
-        try:
-            marks = [int(mark1), int(mark2), int(mark3), int(exam_mark)]
-            if any(m < 0 for m in marks):
-                return False, "Marks cannot be negative"
-            if marks[0] > 20 or marks[1] > 20 or marks[2] > 20:
-                return False, "Course marks must be between 0-20"
-            if marks[3] > 100:
-                return False, "Exam mark must be between 0-100"
-            student = Student(student_code, name, marks[0], marks[1], marks[2], marks[3])
-            self.students.append(student)
-            return True, "Student added successfully"
-        except ValueError:
-            return False, "Invalid marks entered"
+        marks, error = validate_marks(mark1, mark2, mark3, exam_mark)
+        error = error or self._field_error(student_code, name)
+        if error:
+            return False, error
+        student = self._make_student(student_code, name, *marks)
+        self._insert(student)
+        self._track(student)
+        return True, "Student added successfully"
+
+    def bulk_add(self, rows):
+        # Validates the whole batch in one pass and adds every valid row.
+        # rows is an iterable of (code, name, mark1, mark2, mark3, exam_mark);
+        # returns (added count, [(row number, error message), ...]).
+        # Nothing is written to disk; call save_students once afterwards.
+        valid = []
+        errors = []
+        seen = set()
+        for number, row in enumerate(rows, 1):
+            checked, error = validate_new_row(row, self._index.__contains__, seen)
+            error = error or self._field_error(*checked[:2])
+            if error:
+                errors.append((number, error))
+                continue
+            seen.add(checked[0])
+            valid.append(checked)
+
+        added = [self._make_student(code, name, *marks) for code, name, marks in valid]
+        for student in added:
+            self._insert(student)
+        # Re-sorting once beats thousands of single inserts into the sorted indexes
+        if len(added) > BULK_REBUILD_THRESHOLD:
+            self._rebuild_indexes()
+        else:
+            for student in added:
+                self._track(student)
+        return len(added), errors
+
+    def import_csv(self, path, save=True):
+        # Imports code,name,mark1,mark2,mark3,exam rows (optional header row)
+        # and saves once. Returns (added count, errors, saved).
+        with open(path, 'r', newline='', encoding='utf-8-sig') as file:
+            rows = list(csv.reader(file))
+        # A header row has a non-numeric first mark column
+        header = 1 if rows and len(rows[0]) > 2 and not rows[0][2].strip().lstrip('-').isdigit() else 0
+        added, errors = self.bulk_add(rows[header:])
+        errors = [(number + header, message) for number, message in errors]
+        saved = self.save_students() if added and save else True
+        return added, errors, saved
 
     def delete_student(self, student_code):
-        student = self.get_student_by_code(student_code)
+        student = self._index.pop(student_code, None)
         if student:
-            self.students.remove(student)
+            self._untrack(student)
+            self._drop(student)
+            # Drop the list view instead of searching it; it is rebuilt on next access
+            self._students = None
+            self._record("D", student_code)
             return True, "Student deleted successfully"
         return False, "Student not found"
 
@@ -123,46 +1567,880 @@ class StudentManager:
         student = self.get_student_by_code(student_code)
         if not student:
             return False, "Student not found"
+        fields, error = validate_update(kwargs)
+        error = error or self._field_error(name=fields.get('name'))
+        if error:
+            return False, error
+        self._untrack(student)
+        for field, value in fields.items():
+            setattr(student, field, value)
+        self._track(student)
+        self._record("S", student_code, student)
+        return True, "Student updated successfully"
+
+    def batch(self):
+        return UpdateBatch(self)
+
+    def _apply_updates(self, validated):
+        # validated: [(student, fields), ...] that already passed validate_update
+        bulk = len(validated) > BULK_REBUILD_THRESHOLD
+        originals = [(student, {field: getattr(student, field) for field in fields})
+                     for student, fields in validated]
         try:
-            if 'name' in kwargs: 
-                student.name = kwargs['name']
-            if 'mark1' in kwargs: 
-                mark = int(kwargs['mark1'])
-                if mark < 0 or mark > 20:
-                    return False, "Course mark 1 must be between 0-20"
-                student.mark1 = mark
-            if 'mark2' in kwargs: 
-                mark = int(kwargs['mark2'])
-                if mark < 0 or mark > 20:
-                    return False, "Course mark 2 must be between 0-20"
-                student.mark2 = mark
-            if 'mark3' in kwargs: 
-                mark = int(kwargs['mark3'])
-                if mark < 0 or mark > 20:
-                    return False, "Course mark 3 must be between 0-20"
-                student.mark3 = mark
-            if 'exam_mark' in kwargs: 
-                mark = int(kwargs['exam_mark'])
-                if mark < 0 or mark > 100:
-                    return False, "Exam mark must be between 0-100"
-                student.exam_mark = mark
-            return True, "Student updated successfully"
-        except ValueError:
-            return False, "Invalid marks entered"
+            for student, fields in validated:
+                if not bulk:
+                    self._untrack(student)
+                for field, value in fields.items():
+                    setattr(student, field, value)
+                if not bulk:
+                    self._track(student)
+        except Exception:
+            # Put every row back and rebuild the indexes from the restored data
+            for student, fields in originals:
+                for field, value in fields.items():
+                    setattr(student, field, value)
+            self._rebuild_indexes()
+            raise
+        if bulk:
+            self._rebuild_indexes()
+        for student, _ in validated:
+            self._record("S", student.student_code, student)
+
+    def get_highest_scoring_student(self):
+        return self.leaderboard.best()
+
+    def get_lowest_scoring_student(self):
+        return self.leaderboard.worst()
+
+    def get_top_students(self, k=10):
+        return self.leaderboard.top(k)
+
+    def get_bottom_students(self, k=10):
+        return self.leaderboard.bottom(k)
+
+    def get_statistics(self):
+        # count, mean, std_dev, median, percentiles, grades, component_averages
+        return self.stats.summary()
+
+
+def write_text_students(filename, students):
+    # Writes to a temp file and renames it over filename
+    students = list(students)
+    temp_filename = filename + ".tmp"
+    try:
+        with open(temp_filename, 'w', buffering=READ_BUFFER_SIZE) as file:
+            file.write(f"{len(students)}\n")
+            for student in students:
+                file.write(student.to_file_string() + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_filename, filename)
+    except BaseException:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
+
+
+def trim_torn_tail(file):
+    # A crash mid-append can leave a final line without its newline. Readers
+    # skip it, but the next append would be glued onto it and lost as well,
+    # so cut the file back to just after its last newline first.
+    end = file.seek(0, os.SEEK_END)
+    if not end:
+        return
+    file.seek(end - 1)
+    if file.read(1) == b"\n":
+        return
+    position = end
+    while position > 0:
+        start = max(0, position - READ_BUFFER_SIZE)
+        file.seek(start)
+        newline = file.read(position - start).rfind(b"\n")
+        if newline != -1:
+            file.truncate(start + newline + 1)
+            return
+        position = start
+    file.truncate(0)
+
+
+# Converters between the text and binary formats (journals are folded in)
+def text_to_binary(text_filename, binary_filename):
+    # Returns (students written, [(row number, error), ...] for those left out)
+    manager = StudentManager(text_filename)
+    students, errors = binary_storable(manager.get_all_students())
+    write_binary_students(binary_filename, students)
+    return len(students), errors
+
+
+def binary_to_text(binary_filename, text_filename):
+    manager = StudentManager(binary_filename)
+    write_text_students(text_filename, manager.get_all_students())
+    return len(manager)
+
+
+# SQLite backend: the StudentManager API on an indexed database. Lookups, sorts
+# and best/worst queries are index queries and every edit commits one row.
+
+def _grade_case_sql():
+    # Lowest total (out of 160) for each grade, derived from Student itself so
+    # the SQL and Python grades always agree
+    cases = []
+    for letter in "ABCD":
+        lowest = min(total for total in range(161) if Student("", "", 0, 0, 0, total).grade <= letter)
+        cases.append(f"WHEN total >= {lowest} THEN '{letter}'")
+    return f"CASE {' '.join(cases)} ELSE 'F' END"
+
+SQLITE_SORT_EXPRESSIONS = {
+    'student_code': "student_code",
+    'name': "name",
+    'mark1': "mark1",
+    'mark2': "mark2",
+    'mark3': "mark3",
+    'exam_mark': "exam_mark",
+    'total_coursework': "mark1 + mark2 + mark3",
+    'overall_percentage': "total",
+    'grade': _grade_case_sql(),
+}
+
+class SQLiteStudentManager:
+    def __init__(self, filename="JheiromPabloStudentManager/studentMarks.db", **options):
+        self.filename = filename
+        base_dir = os.path.dirname(self.filename)
+        if base_dir:
+            os.makedirs(base_dir, exist_ok=True)
+        self.last_error = None
+        self.conn = sqlite3.connect(filename)
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS students (
+                    id INTEGER PRIMARY KEY,
+                    student_code TEXT NOT NULL UNIQUE,
+                    name TEXT NOT NULL,
+                    mark1 INTEGER NOT NULL,
+                    mark2 INTEGER NOT NULL,
+                    mark3 INTEGER NOT NULL,
+                    exam_mark INTEGER NOT NULL,
+                    total INTEGER NOT NULL
+                )""")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS students_total ON students (total)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS students_name ON students (name)")
+
+    def close(self):
+        self.conn.close()
+
+    def _select(self, where="", params=(), order="id", limit=None, offset=0):
+        sql = f"SELECT student_code, name, mark1, mark2, mark3, exam_mark FROM students {where} ORDER BY {order}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)} OFFSET {int(offset)}"
+        return [Student(*row) for row in self.conn.execute(sql, params)]
+
+    # Every edit is already committed, so loading and saving have nothing to do
+    def load_students(self, progress=None):
+        return True
+
+    def save_students(self):
+        self.conn.commit()
+        return True
+
+    @property
+    def students(self):
+        return self._select()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+
+    def get_all_students(self):
+        return self.students
+
+    def sorted_students(self, column, descending=False):
+        if column not in SQLITE_SORT_EXPRESSIONS:
+            raise ValueError(f"Cannot sort by {column}")
+        direction = "DESC" if descending else "ASC"
+        return self._select(order=f"{SQLITE_SORT_EXPRESSIONS[column]} {direction}, student_code {direction}")
+
+    SEARCH_SQL = "(lower(name) LIKE ? ESCAPE '\\' OR lower(student_code) LIKE ? ESCAPE '\\')"
+
+    @staticmethod
+    def _search_pattern(query):
+        return "%" + query.strip().lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+    def search_students(self, query, limit=None):
+        # Substring match only; the in-memory backend also ranks typo-tolerant matches
+        pattern = self._search_pattern(query)
+        return self._select("WHERE " + self.SEARCH_SQL, (pattern, pattern), order="name, student_code", limit=limit)
+
+    def query(self, sort=None, descending=False, search=None, grade=None,
+              min_percentage=None, max_percentage=None, offset=0, limit=PAGE_SIZES[1]):
+        # Same arguments and Page as StudentManager.query, run as COUNT + LIMIT/OFFSET
+        if sort is not None and sort not in SQLITE_SORT_EXPRESSIONS:
+            raise ValueError(f"Cannot sort by {sort}")
+        clauses, params = [], []
+        if search and search.strip():
+            clauses.append(self.SEARCH_SQL)
+            params += [self._search_pattern(search)] * 2
+        if grade is not None:
+            clauses.append(f"{SQLITE_SORT_EXPRESSIONS['grade']} IN ({', '.join('?' * len(grade))})")
+            params += list(grade)
+        # Percentages are total / 160 * 100, so compare totals to keep using the index
+        if min_percentage is not None:
+            clauses.append("total >= ?")
+            params.append(min_percentage * 160 / 100)
+        if max_percentage is not None:
+            clauses.append("total <= ?")
+            params.append(max_percentage * 160 / 100)
+        where = "WHERE " + " AND ".join(clauses) if clauses else ""
+        if sort:
+            direction = "DESC" if descending else "ASC"
+            order = f"{SQLITE_SORT_EXPRESSIONS[sort]} {direction}, student_code {direction}"
+        else:
+            order = "name, student_code" if search and search.strip() else "id"
+        offset = max(0, offset)
+        total = self.conn.execute(f"SELECT COUNT(*) FROM students {where}", params).fetchone()[0]
+        return Page(self._select(where, params, order, limit, offset), total, offset, limit)
+
+    def get_student_by_code(self, code):
+        students = self._select("WHERE student_code = ?", (code,))
+        return students[0] if students else None
+
+    def add_student(self, student_code, name, mark1, mark2, mark3, exam_mark):
+        if self.get_student_by_code(student_code):
+            return False, "Student code already exists"
+        marks, error = validate_marks(mark1, mark2, mark3, exam_mark)
+        if error:
+            return False, error
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO students (student_code, name, mark1, mark2, mark3, exam_mark, total) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", (student_code, name, *marks, sum(marks)))
+        return True, "Student added successfully"
+
+    def bulk_add(self, rows):
+        # Same validation and return value as StudentManager.bulk_add, in one transaction
+        valid = []
+        errors = []
+        seen = set()
+        exists = lambda code: self.conn.execute(
+            "SELECT 1 FROM students WHERE student_code = ?", (code,)).fetchone() is not None
+        for number, row in enumerate(rows, 1):
+            checked, error = validate_new_row(row, exists, seen)
+            if error:
+                errors.append((number, error))
+                continue
+            student_code, name, marks = checked
+            seen.add(student_code)
+            valid.append((student_code, name, *marks, sum(marks)))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO students (student_code, name, mark1, mark2, mark3, exam_mark, total) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", valid)
+        return len(valid), errors
+
+    import_csv = StudentManager.import_csv
+
+    def delete_student(self, student_code):
+        with self.conn:
+            deleted = self.conn.execute("DELETE FROM students WHERE student_code = ?", (student_code,)).rowcount
+        if deleted:
+            return True, "Student deleted successfully"
+        return False, "Student not found"
+
+    def update_student(self, student_code, **kwargs):
+        student = self.get_student_by_code(student_code)
+        if not student:
+            return False, "Student not found"
+        fields, error = validate_update(kwargs)
+        if error:
+            return False, error
+        self._apply_updates([(student, fields)])
+        return True, "Student updated successfully"
+
+    def batch(self):
+        return UpdateBatch(self)
+
+    def _apply_updates(self, validated):
+        # One transaction for the whole batch; SQLite rolls it back on error
+        rows = []
+        for student, fields in validated:
+            for field, value in fields.items():
+                setattr(student, field, value)
+            rows.append((student.name, student.mark1, student.mark2, student.mark3, student.exam_mark,
+                         student.total_coursework + student.exam_mark, student.student_code))
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE students SET name = ?, mark1 = ?, mark2 = ?, mark3 = ?, exam_mark = ?, total = ? "
+                "WHERE student_code = ?", rows)
 
     def get_highest_scoring_student(self):
-        if not self.students: return None
-        return max(self.students, key=lambda x: x.overall_percentage)
+        students = self._select(order="total DESC, id", limit=1)
+        return students[0] if students else None
 
     def get_lowest_scoring_student(self):
-        if not self.students: return None
-        return min(self.students, key=lambda x: x.overall_percentage)
+        students = self._select(order="total ASC, id", limit=1)
+        return students[0] if students else None
+
+    def get_top_students(self, k=10):
+        return self._select(order="total DESC, id", limit=k)
+
+    def get_bottom_students(self, k=10):
+        return self._select(order="total ASC, id", limit=k)
+
+    def get_statistics(self):
+        stats = CohortStats()
+        rows = self.conn.execute(
+            "SELECT total, COUNT(*), SUM(mark1), SUM(mark2), SUM(mark3), SUM(exam_mark) FROM students GROUP BY total")
+        for total, count, *component_sums in rows:
+            stats.add_group(total, count, component_sums)
+        return stats.summary()
+
+
+def open_manager(filename, backend=None, **options):
+    # A StudentManager, or a SQLiteStudentManager for backend="sqlite"; without
+    # a backend, .db files open in SQLite and everything else as a text or .bin file
+    if backend is None:
+        backend = "sqlite" if filename.endswith(".db") else "text"
+    if backend == "sqlite":
+        return SQLiteStudentManager(filename, **options)
+    if backend != "text":
+        raise ValueError(f"Unknown backend: {backend}")
+    return StudentManager(filename, **options)
+
+
+def migrate_text_to_sqlite(text_filename, db_filename):
+    # One-shot copy of a studentMarks.txt file (and its journal) into a database
+    source = StudentManager(text_filename)
+    target = SQLiteStudentManager(db_filename)
+    with target.conn:
+        target.conn.executemany(
+            "INSERT OR REPLACE INTO students (student_code, name, mark1, mark2, mark3, exam_mark, total) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((s.student_code, s.name, s.mark1, s.mark2, s.mark3, s.exam_mark,
+              s.total_coursework + s.exam_mark) for s in source.get_all_students()))
+    count = len(target)
+    target.close()
+    return count
+
+
+# Background persistence for the GUI: file work runs on one worker thread in
+# submission order, and results are handed back on the Tk thread by polling
+# a queue with root.after. Saves requested within `delay` ms are coalesced.
+
+SAVE_DELAY_MS = 300
+POLL_MS = 50
+WATCH_MS = 2000
+SEARCH_DELAY_MS = 150
+
+class PersistenceWorker:
+    def __init__(self, manager, root, delay=SAVE_DELAY_MS):
+        self.manager = manager
+        self.root = root
+        self.delay = delay
+        self.loading = False
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._outstanding = 0
+        self._polling = False
+        self._save_timer = None
+        self._save_callbacks = []
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            func, args, callback = job
+            self._results.put((callback, func(*args), True))
+
+    def _submit(self, func, args, callback):
+        self._outstanding += 1
+        self._jobs.put((func, args, callback))
+        self._poll_soon()
+
+    def _poll_soon(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        self._polling = False
+        while True:
+            try:
+                callback, result, finished = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if finished:
+                self._outstanding -= 1
+            callback(result)
+        if self._outstanding:
+            self._poll_soon()
+
+    def request_save(self, on_done=None):
+        # on_done(error) runs on the Tk thread once the coalesced write finishes
+        if on_done:
+            self._save_callbacks.append(on_done)
+        if self._save_timer is not None:
+            self.root.after_cancel(self._save_timer)
+        self._save_timer = self.root.after(self.delay, self.flush)
+
+    def flush(self):
+        # Starts any debounced save now
+        if self._save_timer is not None:
+            self.root.after_cancel(self._save_timer)
+            self._save_timer = None
+        callbacks, self._save_callbacks = self._save_callbacks, []
+        job = self.manager.prepare_save()
+        if job == ([], None) and not callbacks:
+            return
+        self._submit(self.manager.write_save, (job,), lambda error: self._saved(error, job, callbacks))
+
+    def _saved(self, error, job, callbacks):
+        if error:
+            self.manager.save_failed(job)
+        for callback in callbacks:
+            callback(error)
+
+    def request_load(self, on_done=None, progress=None, incremental=False):
+        # on_done(error, changed) runs after the new data is installed, where changed
+        # is the number of students touched by an incremental reload (None for a
+        # full load); progress(loaded, expected) is forwarded to the Tk thread.
+        # Unsaved edits are written first.
+        self.flush()
+        self.loading = True
+        forward = None
+        if progress:
+            forward = lambda loaded, expected: self._results.put((lambda _: progress(loaded, expected), None, False))
+        if incremental:
+            read, install = self.manager.read_changes, self.manager.install_changes
+        else:
+            read, install = self.manager.read_students, self.manager.install_students
+        self._submit(read, (forward,), lambda loaded: self._loaded(install, loaded, on_done))
+
+    def _loaded(self, install, loaded, on_done):
+        try:
+            changed = install(loaded)
+        finally:
+            self.loading = False
+        if on_done:
+            on_done(self.manager.last_error, changed)
+
+    def close(self):
+        # Writes anything still pending and waits for the worker to finish
+        if self._save_timer is not None or self.manager._pending:
+            self.flush()
+        self._jobs.put(None)
+        self._thread.join()
+
+
+# Command line: python Manager.py <command> ...; with no command the GUI opens
+
+STUDENT_FIELDS = ('student_code', 'name', 'mark1', 'mark2', 'mark3', 'exam_mark')
+
+def print_students(students, output="table"):
+    if output == "json":
+        print(json.dumps([dict({field: getattr(student, field) for field in STUDENT_FIELDS},
+                               overall_percentage=round(student.overall_percentage, 2), grade=student.grade)
+                          for student in students], indent=2))
+    elif output == "csv":
+        for student in students:
+            print(student.to_file_string())
+    else:
+        print(f"{'Code':<8} {'Name':<28} {'Coursework':>10} {'Exam':>5} {'%':>7} Grade")
+        for student in students:
+            print(f"{student.student_code:<8} {student.name:<28} {student.total_coursework:>7}/60 "
+                  f"{student.exam_mark:>5} {student.overall_percentage:>6.2f}% {student.grade}")
+
+
+def print_statistics(stats, output="table"):
+    if output == "json":
+        print(json.dumps(stats, indent=2))
+        return
+    print(f"Students: {stats['count']}")
+    if not stats['count']:
+        return
+    print(f"Mean: {stats['mean']:.2f}%  Std dev: {stats['std_dev']:.2f}  Median: {stats['median']:.2f}%")
+    print("Percentiles: " + "  ".join(f"p{p}={value:.2f}%" for p, value in stats['percentiles'].items()))
+    print("Grades: " + "  ".join(f"{grade}={count}" for grade, count in stats['grades'].items()))
+    print("Component averages: " + "  ".join(f"{name}={value:.2f}"
+                                            for name, value in stats['component_averages'].items()))
+
+
+def export_students(manager, path):
+    # Format follows the extension: .csv, .bin, .db, anything else is studentMarks text.
+    # The target is replaced, not merged into. Returns (exported count, errors),
+    # where errors are (row number, message) for rows a .bin or .db target rejected.
+    students = manager.get_all_students()
+    if path.endswith(".csv"):
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(STUDENT_FIELDS)
+            writer.writerows([getattr(student, field) for field in STUDENT_FIELDS] for student in students)
+    elif path.endswith(".bin"):
+        students, errors = binary_storable(students)
+        write_binary_students(path, students)
+        return len(students), errors
+    elif path.endswith(".db"):
+        # Built in a fresh temp database and renamed over path, like the other writers
+        temp_filename = path + ".tmp"
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        target = SQLiteStudentManager(temp_filename)
+        try:
+            added, errors = target.bulk_add([[getattr(student, field) for field in STUDENT_FIELDS] for student in students])
+        finally:
+            target.close()
+        os.replace(temp_filename, path)
+        return added, errors
+    else:
+        write_text_students(path, students)
+    return len(students), []
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="Manager.py", description="Student Manager (no command opens the GUI)")
+    parser.add_argument("--file", default="JheiromPabloStudentManager/studentMarks.txt",
+                        help="student data: .txt, .bin or .db (SQLite)")
+    parser.add_argument("--format", dest="output", choices=("table", "csv", "json"), default="table")
+    # Also accepted after the command; SUPPRESS keeps the value given before it
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--format", dest="output", choices=("table", "csv", "json"), default=argparse.SUPPRESS)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes for parsing large text files (0 = one per CPU)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    listing = sub.add_parser("list", help="show every student", parents=[common])
+    listing.add_argument("--limit", type=int)
+    find = sub.add_parser("find", help="look up a code, or search names and codes", parents=[common])
+    find.add_argument("query")
+    find.add_argument("--limit", type=int, default=50)
+    add = sub.add_parser("add", help="add a student", parents=[common])
+    add.add_argument("code")
+    add.add_argument("name")
+    for field in ('mark1', 'mark2', 'mark3', 'exam_mark'):
+        add.add_argument(field)
+    update = sub.add_parser("update", help="change a student's name or marks", parents=[common])
+    update.add_argument("code")
+    for field in ('name', 'mark1', 'mark2', 'mark3', 'exam_mark'):
+        update.add_argument("--" + field.replace('_', '-'), dest=field)
+    delete = sub.add_parser("delete", help="delete a student", parents=[common])
+    delete.add_argument("code")
+    sort = sub.add_parser("sort", help="list students in a Sort menu order (1-7) or by any column", parents=[common])
+    sort.add_argument("order", help="1-7 or one of: " + ", ".join(SORT_COLUMNS))
+    sort.add_argument("--desc", action="store_true", help="descending, when sorting by column")
+    sort.add_argument("--limit", type=int)
+    sub.add_parser("stats", help="cohort statistics", parents=[common])
+    import_parser = sub.add_parser("import", help="add students from a CSV file", parents=[common])
+    import_parser.add_argument("path")
+    export = sub.add_parser("export", help="write all students to .csv, .bin, .db or text", parents=[common])
+    export.add_argument("path")
+    return parser
+
+
+def run_command(manager, args):
+    # Returns (exit status, message for stderr or None); listings print directly
+    command = args.command
+    if command == "list":
+        print_students(manager.get_all_students()[:args.limit], args.output)
+    elif command == "find":
+        student = manager.get_student_by_code(args.query)
+        matches = [student] if student else manager.search_students(args.query, limit=args.limit)
+        if not matches:
+            return 1, "No matching students"
+        print_students(matches, args.output)
+    elif command == "sort":
+        if args.order in SORT_ORDERS:
+            column, descending, _ = SORT_ORDERS[args.order]
+        elif args.order in SORT_COLUMNS:
+            column, descending = args.order, args.desc
+        else:
+            return 2, f"Unknown sort order: {args.order}"
+        print_students(manager.sorted_students(column, descending)[:args.limit], args.output)
+    elif command == "stats":
+        print_statistics(manager.get_statistics(), args.output)
+    elif command == "export":
+        count, errors = export_students(manager, args.path)
+        message = "\n".join([f"Exported {count} students to {args.path}"] + [f"row {row}: {error}" for row, error in errors])
+        return (1 if errors else 0), message
+    else:
+        if command == "add":
+            ok, message = manager.add_student(args.code, args.name, args.mark1, args.mark2, args.mark3, args.exam_mark)
+        elif command == "update":
+            fields = {field: getattr(args, field) for field in ('name', 'mark1', 'mark2', 'mark3', 'exam_mark')
+                      if getattr(args, field) is not None}
+            ok, message = manager.update_student(args.code, **fields) if fields else (False, "Nothing to update")
+        elif command == "delete":
+            ok, message = manager.delete_student(args.code)
+        else:
+            # Valid rows are kept even when others are rejected, as in the GUI
+            added, errors, _ = manager.import_csv(args.path, save=False)
+            ok = added > 0 or not errors
+            message = "\n".join([f"Imported {added} students"] + [f"row {row}: {error}" for row, error in errors])
+        if not ok:
+            return 1, message
+        if not manager.save_students():
+            return 1, f"Error saving data: {manager.last_error}"
+        return (1 if command == "import" and errors else 0), message
+    return 0, None
+
+
+def cli(argv):
+    args = build_parser().parse_args(argv)
+    # An exact code on an unedited .bin file is binary-searched in the mapped
+    # file instead of loading every student
+    if (args.command == "find" and args.file.endswith(".bin") and os.path.exists(args.file)
+            and not os.path.exists(args.file + ".journal")):
+        try:
+            with BinaryStudentFile(args.file) as source:
+                student = source.get_student_by_code(args.query)
+        except ValueError:
+            student = None
+        if student:
+            print_students([student], args.output)
+            return 0
+    backend = "sqlite" if args.file.endswith(".db") else "text"
+    # Text files are journaled so a one-row edit appends instead of rewriting the file
+    options = {} if backend == "sqlite" else {"journal": True, "workers": args.workers}
+    manager = open_manager(args.file, backend, **options)
+    try:
+        if manager.last_error:
+            print(f"Error loading data: {manager.last_error}", file=sys.stderr)
+            return 1
+        if getattr(manager, "duplicate_codes", None):
+            print(f"Warning: duplicate student codes, last row kept: {', '.join(manager.duplicate_codes[:10])}"
+                  + (" ..." if len(manager.duplicate_codes) > 10 else ""), file=sys.stderr)
+        status, message = run_command(manager, args)
+    finally:
+        if backend == "sqlite":
+            manager.close()
+    if message:
+        print(message, file=sys.stderr if status else sys.stdout)
+    return status
 
 
 # GUI App
 
-ctk.set_appearance_mode("Dark")
-ctk.set_default_color_theme("blue")
+GRADE_COLORS = {"A":"#4CAF50", "B":"#9FE055", "C":"#FFC107", "D":"#FF9800", "F":"#F44336"}
+CARD_COLUMNS = 3
+CARD_ROW_HEIGHT = 170
+
+# Modern Card Functions 
+class StudentCard:
+    def __init__(self, parent):
+        self.student = None
+        self.frame = ctk.CTkFrame(parent, corner_radius=12, border_width=1, border_color="#4D4D4D")
+        self.frame.grid_columnconfigure(0, weight=1)
+
+        self.name_label = ctk.CTkLabel(
+            self.frame, 
+            text="", 
+            font=ctk.CTkFont(size=16, weight="bold")
+        )
+        self.name_label.grid(row=0, column=0, sticky="w", padx=15, pady=(12,2))
+
+        self.code_label = ctk.CTkLabel(
+            self.frame, 
+            text="", 
+            font=ctk.CTkFont(size=12)
+        )
+        self.code_label.grid(row=1, column=0, sticky="w", padx=15, pady=2)
+
+        self.marks_label = ctk.CTkLabel(
+            self.frame, 
+            text="", 
+            font=ctk.CTkFont(size=12),
+            justify="left"
+        )
+        self.marks_label.grid(row=2, column=0, sticky="w", padx=15, pady=4)
+
+        self.grade_label = ctk.CTkLabel(
+            self.frame, 
+            text="", 
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        self.grade_label.grid(row=3, column=0, sticky="w", padx=15, pady=(2,12))
+
+    def widgets(self):
+        return [self.frame, self.name_label, self.code_label, self.marks_label, self.grade_label]
+
+    def show(self, student):
+        self.student = student
+        marks_text = (f"Coursework: {student.total_coursework}/60\n"
+                      f"Exam: {student.exam_mark}/100\n"
+                      f"Overall: {student.overall_percentage:.2f}%")
+        self.name_label.configure(text=student.name)
+        self.code_label.configure(text=f"Code: {student.student_code}")
+        self.marks_label.configure(text=marks_text)
+        self.grade_label.configure(
+            text=f"Grade: {student.grade}",
+            text_color=GRADE_COLORS.get(student.grade, "#FFFFFF")
+        )
+
+
+# Virtualized card grid: only enough cards to fill the viewport are created,
+# and scrolling rebinds that fixed pool to the students now in view
+class VirtualCardGrid:
+    def __init__(self, parent, columns=CARD_COLUMNS, row_height=CARD_ROW_HEIGHT):
+        self.columns = columns
+        self.row_height = row_height
+        self.students = []
+        self.top_row = 0
+        self.visible_rows = 1
+        self.cards = []
+
+        self.frame = ctk.CTkFrame(parent, fg_color="transparent")
+        self.frame.grid_rowconfigure(1, weight=1)
+        self.frame.grid_columnconfigure(0, weight=1)
+
+        self.title_label = ctk.CTkLabel(
+            self.frame, 
+            text="", 
+            font=ctk.CTkFont(size=22, weight="bold")
+        )
+        self.title_label.grid(row=0, column=0, columnspan=2, pady=(0,20), sticky="w")
+
+        self.body = ctk.CTkFrame(self.frame, fg_color="transparent")
+        self.body.grid(row=1, column=0, sticky="nswe")
+        self.body.grid_propagate(False)
+        for c in range(columns):
+            self.body.grid_columnconfigure(c, weight=1, minsize=250)
+
+        self.scrollbar = ctk.CTkScrollbar(self.frame, command=self.on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+
+        self.empty_label = ctk.CTkLabel(
+            self.body, 
+            text="No students found", 
+            font=ctk.CTkFont(size=16)
+        )
+
+        self.body.bind("<Configure>", self.on_resize)
+        self.bind_wheel(self.body)
+        self.resize_pool()
+
+    @property
+    def total_rows(self):
+        return math.ceil(len(self.students) / self.columns)
+
+    def bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self.on_wheel)
+        widget.bind("<Button-4>", self.on_wheel)
+        widget.bind("<Button-5>", self.on_wheel)
+
+    def resize_pool(self):
+        # Grow the pool when the viewport gets taller; extra cards are just hidden
+        needed = self.visible_rows * self.columns
+        while len(self.cards) < needed:
+            index = len(self.cards)
+            card = StudentCard(self.body)
+            card.frame.grid(row=index // self.columns, column=index % self.columns, padx=10, pady=10, sticky="nsew")
+            for widget in card.widgets():
+                self.bind_wheel(widget)
+            self.cards.append(card)
+
+    def set_students(self, students, title="Students"):
+        self.students = students
+        self.top_row = 0
+        self.title_label.configure(text=title)
+        if students:
+            self.empty_label.grid_remove()
+        else:
+            self.empty_label.grid(row=0, column=0, pady=30, sticky="w")
+        self.render(force=True)
+
+    def render(self, force=False):
+        first = self.top_row * self.columns
+        for i, card in enumerate(self.cards):
+            index = first + i
+            if i < self.visible_rows * self.columns and index < len(self.students):
+                student = self.students[index]
+                if force or card.student is not student:
+                    card.show(student)
+                card.frame.grid()
+            else:
+                card.student = None
+                card.frame.grid_remove()
+
+        total = self.total_rows
+        if total:
+            self.scrollbar.set(self.top_row / total, min(1.0, (self.top_row + self.visible_rows) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_to(self, row):
+        row = max(0, min(row, self.total_rows - self.visible_rows))
+        if row != self.top_row:
+            self.top_row = row
+            self.render()
+
+    def on_resize(self, event):
+        # Cards may render taller than row_height (fonts, scaling); use whichever is larger
+        row_height = max(self.row_height, self.cards[0].frame.winfo_reqheight() + 20)
+        rows = max(1, event.height // row_height)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.resize_pool()
+            self.scroll_to(self.top_row)
+            self.render()
+
+    def on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.scroll_to(round(float(args[0]) * self.total_rows))
+        elif action == "scroll":
+            step = int(args[0])
+            if len(args) > 1 and args[1] == "pages":
+                step *= self.visible_rows
+            self.scroll_to(self.top_row + step)
+
+    def on_wheel(self, event):
+        if event.num == 5 or event.delta < 0:
+            self.scroll_to(self.top_row + 1)
+        else:
+            self.scroll_to(self.top_row - 1)
+
+
+# Paging controls shown under the card grid for list, search and sort views
+class Pager:
+    def __init__(self, parent, on_page, on_page_size, page_size):
+        self.page = None
+        self.frame = ctk.CTkFrame(parent, fg_color="transparent")
+
+        self.prev_button = ctk.CTkButton(
+            self.frame, 
+            text="< Prev", 
+            width=90, 
+            command=lambda: on_page(self.page.prev_offset)
+        )
+        self.prev_button.pack(side="left")
+
+        self.page_label = ctk.CTkLabel(self.frame, text="", font=ctk.CTkFont(size=13))
+        self.page_label.pack(side="left", padx=15)
+
+        self.next_button = ctk.CTkButton(
+            self.frame, 
+            text="Next >", 
+            width=90, 
+            command=lambda: on_page(self.page.next_offset)
+        )
+        self.next_button.pack(side="left")
+
+        self.size_menu = ctk.CTkOptionMenu(
+            self.frame, 
+            values=[str(size) for size in PAGE_SIZES], 
+            width=80, 
+            command=lambda value: on_page_size(int(value))
+        )
+        self.size_menu.set(str(page_size))
+        self.size_menu.pack(side="right")
+        ctk.CTkLabel(self.frame, text="Per page").pack(side="right", padx=10)
+
+    def show(self, page):
+        self.page = page
+        first = page.offset + 1 if page.students else 0
+        last = page.offset + len(page.students)
+        self.page_label.configure(text=f"Page {page.number} of {page.pages}   ({first}-{last} of {page.total})")
+        self.prev_button.configure(state="normal" if page.prev_offset is not None else "disabled")
+        self.next_button.configure(state="normal" if page.next_offset is not None else "disabled")
+
 
 class StudentManagerApp:
     def __init__(self, root):
@@ -171,7 +2449,15 @@ class StudentManagerApp:
         self.root.geometry("1200x700")
         self.root.minsize(1000,600)
 
-        self.manager = StudentManager()
+        self.manager = StudentManager(journal=True, autoload=False)
+        self.io = PersistenceWorker(self.manager, self.root)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.card_grid = None
+        self.pager = None
+        # The paged view on screen: (title, query() arguments) and its offset
+        self.current_query = None
+        self.page_offset = 0
+        self.page_size = PAGE_SIZES[1]
 
         # Fix the grid configuration
         self.root.grid_rowconfigure(0, weight=1)
@@ -202,6 +2488,20 @@ class StudentManagerApp:
         )
         self.header_label.pack(side="left", padx=20, pady=20)
 
+        # Live search: results update as the user types (debounced)
+        self.search_entry = ctk.CTkEntry(
+            self.header_frame, 
+            width=260, 
+            placeholder_text="Search name or code"
+        )
+        self.search_entry.pack(side="right", padx=20, pady=20)
+        self.search_entry.bind("<KeyRelease>", self.on_search_typed)
+        self.search_timer = None
+
+        # Load progress, only shown while a file is being read
+        self.progress_bar = ctk.CTkProgressBar(self.header_frame, width=200)
+        self.progress_bar.set(0)
+
         # Content frame
         self.content_frame = ctk.CTkFrame(self.main_frame, corner_radius=0)
         self.content_frame.grid(row=1, column=0, sticky="nswe", padx=0, pady=0)
@@ -273,6 +2573,14 @@ class StudentManagerApp:
         )
         self.btn_refresh.grid(row=7, column=0, padx=15, pady=8, sticky="we")
 
+        self.btn_import = ctk.CTkButton(
+            self.sidebar, 
+            text="Import CSV", 
+            command=self.import_students,
+            height=40
+        )
+        self.btn_import.grid(row=8, column=0, padx=15, pady=8, sticky="we")
+
         # Theme toggle at bottom
         self.theme_toggle = ctk.CTkSegmentedButton(
             self.sidebar, 
@@ -280,89 +2588,66 @@ class StudentManagerApp:
             command=self.change_theme
         )
         self.theme_toggle.set("Dark")
-        self.theme_toggle.grid(row=10, column=0, padx=15, pady=(10,20), sticky="we")
+        self.theme_toggle.grid(row=11, column=0, padx=15, pady=(10,20), sticky="we")
+
+        # Reload automatically when the file changes on disk
+        self.watch_switch = ctk.CTkSwitch(
+            self.sidebar, 
+            text="Auto refresh", 
+            command=self.toggle_watch
+        )
+        self.watch_switch.grid(row=10, column=0, padx=15, pady=(10,0), sticky="w")
+        self.watch_timer = None
 
         # Initial page
+        self.redisplay = self.show_welcome
         self.show_welcome()
+        self.load_data()
 
-    # Modern Card Functions 
-    def create_student_card(self, parent, student):
-        grade_colors = {"A":"#4CAF50", "B":"#9FE055", "C":"#FFC107", "D":"#FF9800", "F":"#F44336"}
-        card = ctk.CTkFrame(parent, corner_radius=12, border_width=1, border_color="#4D4D4D")
-        card.grid_columnconfigure(0, weight=1)
-        
-        ctk.CTkLabel(
-            card, 
-            text=student.name, 
-            font=ctk.CTkFont(size=16, weight="bold")
-        ).grid(row=0, column=0, sticky="w", padx=15, pady=(12,2))
-        
-        ctk.CTkLabel(
-            card, 
-            text=f"Code: {student.student_code}", 
-            font=ctk.CTkFont(size=12)
-        ).grid(row=1, column=0, sticky="w", padx=15, pady=2)
-        
-        marks_text = (f"Coursework: {student.total_coursework}/60\n"
-                      f"Exam: {student.exam_mark}/100\n"
-                      f"Overall: {student.overall_percentage:.2f}%")
-        ctk.CTkLabel(
-            card, 
-            text=marks_text, 
-            font=ctk.CTkFont(size=12),
-            justify="left"
-        ).grid(row=2, column=0, sticky="w", padx=15, pady=4)
-        
-        ctk.CTkLabel(
-            card, 
-            text=f"Grade: {student.grade}", 
-            font=ctk.CTkFont(size=14, weight="bold"),
-            text_color=grade_colors.get(student.grade, "#FFFFFF")
-        ).grid(row=3, column=0, sticky="w", padx=15, pady=(2,12))
-        
-        return card
-
-    def display_students_cards(self, students, title="Students"):
-        # Clear content frame
+    def clear_content(self):
         for widget in self.content_frame.winfo_children():
             widget.destroy()
-
-        # Scrollable frame
-        scrollable_frame = ctk.CTkScrollableFrame(self.content_frame)
-        scrollable_frame.pack(fill="both", expand=True, padx=20, pady=20)
-
-        header = ctk.CTkLabel(
-            scrollable_frame, 
-            text=title, 
-            font=ctk.CTkFont(size=22, weight="bold")
-        )
-        header.grid(row=0, column=0, columnspan=3, pady=(0,20), sticky="w")
-
-        if not students:
-            no_data_label = ctk.CTkLabel(
-                scrollable_frame, 
-                text="No students found", 
-                font=ctk.CTkFont(size=16)
-            )
-            no_data_label.grid(row=1, column=0, pady=30, sticky="w")
-            return
-
-        # Grid: 3 cards per row
-        cols = 3
-        for index, student in enumerate(students):
-            row = index // cols + 1
-            col = index % cols
-            card = self.create_student_card(scrollable_frame, student)
-            card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-
-        # Make columns expand equally
-        for c in range(cols):
-            scrollable_frame.grid_columnconfigure(c, weight=1, minsize=250)
+        self.card_grid = None
+        self.pager = None
+
+    def display_students_cards(self, students, title="Students", page=None):
+        # Reuse the grid if it is already on screen so cards are updated in place
+        if self.card_grid is None:
+            self.clear_content()
+            self.pager = Pager(self.content_frame, self.show_page, self.set_page_size, self.page_size)
+            self.card_grid = VirtualCardGrid(self.content_frame)
+            self.card_grid.frame.pack(fill="both", expand=True, padx=20, pady=(20,10))
+        if page is None:
+            self.pager.frame.pack_forget()
+        else:
+            self.pager.frame.pack(side="bottom", fill="x", padx=20, pady=(0,15), before=self.card_grid.frame)
+            self.pager.show(page)
+        self.card_grid.set_students(students, title=title)
+
+    # Paged views: only the rows of the current page are fetched and shown
+    def show_query(self, title, **query):
+        self.current_query = (title, query)
+        self.redisplay = lambda: self.show_page(self.page_offset)
+        self.show_page(0)
+
+    def show_page(self, offset):
+        title, query = self.current_query
+        page = self.manager.query(offset=offset, limit=self.page_size, **query)
+        if offset and not page.students and page.total:
+            # Rows were deleted from under the last page; step back to the new last page
+            page = self.manager.query(offset=page.last_offset(), limit=self.page_size, **query)
+        self.page_offset = page.offset
+        self.display_students_cards(page.students, title=title, page=page)
+
+    def set_page_size(self, size):
+        # Keep the first row on screen in view when the page size changes
+        self.page_size = size
+        self.show_page(self.page_offset // size * size)
 
     #  Welcome Page 
     def show_welcome(self):
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+        self.redisplay = self.show_welcome
+        self.clear_content()
 
         welcome_frame = ctk.CTkFrame(self.content_frame, corner_radius=0)
         welcome_frame.pack(fill="both", expand=True, padx=40, pady=40)
@@ -373,14 +2658,14 @@ class StudentManagerApp:
             font=ctk.CTkFont(size=28, weight="bold")
         ).pack(pady=(20,30))
 
-        stats_text = f"Total Students: {len(self.manager.students)}"
+        stats_text = f"Total Students: {len(self.manager)}"
         ctk.CTkLabel(
             welcome_frame, 
             text=stats_text, 
             font=ctk.CTkFont(size=18)
         ).pack(pady=15)
 
-        if self.manager.students:
+        if len(self.manager):
             highest = self.manager.get_highest_scoring_student()
             lowest = self.manager.get_lowest_scoring_student()
 
@@ -401,29 +2686,158 @@ class StudentManagerApp:
                 text_color="#F89D15"
             ).pack(pady=8)
 
+            # Top 10 / Bottom 10 side by side
+            ranking_frame = ctk.CTkFrame(welcome_frame, fg_color="transparent")
+            ranking_frame.pack(pady=(20,0))
+            rankings = [
+                ("Top 10", self.manager.get_top_students(10), "#4CAF50"),
+                ("Bottom 10", self.manager.get_bottom_students(10), "#F89D15"),
+            ]
+            for col, (title, students, color) in enumerate(rankings):
+                lines = [f"{i}. {s.name} - {s.overall_percentage:.2f}%" for i, s in enumerate(students, 1)]
+                ctk.CTkLabel(
+                    ranking_frame,
+                    text=title,
+                    font=ctk.CTkFont(size=16, weight="bold"),
+                    text_color=color
+                ).grid(row=0, column=col, padx=30, sticky="w")
+                ctk.CTkLabel(
+                    ranking_frame,
+                    text="\n".join(lines),
+                    font=ctk.CTkFont(size=13),
+                    justify="left"
+                ).grid(row=1, column=col, padx=30, pady=5, sticky="nw")
+
+            self.show_statistics(ranking_frame, column=2)
+
+    def show_statistics(self, parent, column):
+        # Dashboard column built from the manager's running aggregates
+        stats = self.manager.get_statistics()
+        percentiles = stats["percentiles"]
+        averages = stats["component_averages"]
+        summary_text = (f"Mean: {stats['mean']:.2f}%   Std dev: {stats['std_dev']:.2f}\n"
+                        f"Median: {stats['median']:.2f}%\n"
+                        + "   ".join(f"P{p}: {value:.1f}%" for p, value in percentiles.items()) + "\n"
+                        f"Avg coursework: {averages['mark1']:.1f} / {averages['mark2']:.1f} / {averages['mark3']:.1f} (of 20)\n"
+                        f"Avg exam: {averages['exam_mark']:.1f} / 100")
+
+        ctk.CTkLabel(
+            parent,
+            text="Statistics",
+            font=ctk.CTkFont(size=16, weight="bold")
+        ).grid(row=0, column=column, padx=30, sticky="w")
+
+        stats_frame = ctk.CTkFrame(parent, fg_color="transparent")
+        stats_frame.grid(row=1, column=column, padx=30, pady=5, sticky="nw")
+        ctk.CTkLabel(
+            stats_frame,
+            text=summary_text,
+            font=ctk.CTkFont(size=13),
+            justify="left"
+        ).grid(row=0, column=0, columnspan=3, sticky="w", pady=(0,8))
+
+        for row, (grade, count) in enumerate(stats["grades"].items(), 1):
+            ctk.CTkLabel(stats_frame, text=grade, font=ctk.CTkFont(size=13, weight="bold"),
+                         text_color=GRADE_COLORS.get(grade, "#FFFFFF")).grid(row=row, column=0, sticky="w")
+            bar = ctk.CTkProgressBar(stats_frame, width=160, progress_color=GRADE_COLORS.get(grade))
+            bar.set(count / stats["count"])
+            bar.grid(row=row, column=1, padx=8, pady=2)
+            ctk.CTkLabel(stats_frame, text=str(count), font=ctk.CTkFont(size=12)).grid(row=row, column=2, sticky="w")
+
     #  Actions 
     def refresh_data(self):
-        self.manager.load_students()
-        self.show_welcome()
-        messagebox.showinfo("Info","Data refreshed from file.")
+        self.load_data(notify=True, incremental=True)
+
+    def load_data(self, notify=False, incremental=False):
+        self.progress_bar.set(0)
+        self.progress_bar.pack(side="right", padx=20, pady=20)
+
+        def done(error, changed):
+            self.progress_bar.pack_forget()
+            self.show_welcome()
+            if error:
+                messagebox.showerror("Error loading file", error)
+            elif notify and changed == 0:
+                messagebox.showinfo("Info","No changes on disk.")
+            elif notify:
+                messagebox.showinfo("Info","Data refreshed from file.")
+
+        self.io.request_load(on_done=done, progress=self.show_load_progress, incremental=incremental)
+
+    def toggle_watch(self):
+        if self.watch_switch.get():
+            self.watch_file()
+        elif self.watch_timer is not None:
+            self.root.after_cancel(self.watch_timer)
+            self.watch_timer = None
+
+    def watch_file(self):
+        self.watch_timer = self.root.after(WATCH_MS, self.watch_file)
+        if not self.io.loading and self.manager.has_file_changed():
+            self.io.request_load(on_done=self.on_file_reloaded, incremental=True)
+
+    def on_file_reloaded(self, error, changed):
+        if error:
+            # Stop polling rather than repeating the same error every few seconds
+            self.watch_switch.deselect()
+            self.toggle_watch()
+            messagebox.showerror("Error loading file", error)
+        elif changed:
+            self.redisplay()
+
+    def show_load_progress(self, loaded, expected):
+        self.progress_bar.set(loaded / expected if expected else 1)
+
+    def busy_loading(self):
+        if self.io.loading:
+            messagebox.showinfo("Info","Still loading data, please wait.")
+            return True
+        return False
+
+    def on_saved(self, error):
+        if error:
+            messagebox.showerror("Error saving file", error)
+
+    def on_close(self):
+        self.io.close()
+        self.root.destroy()
 
     def view_all_students(self):
-        students = self.manager.get_all_students()
-        if not students:
+        if not len(self.manager):
             messagebox.showinfo("Info","No students found.")
             return
-        self.display_students_cards(students, title="All Students")
+        self.show_query("All Students")
+
+    def on_search_typed(self, event=None):
+        if self.search_timer is not None:
+            self.root.after_cancel(self.search_timer)
+        self.search_timer = self.root.after(SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self):
+        self.search_timer = None
+        query = self.search_entry.get().strip()
+        if not query:
+            self.view_all_students()
+            return
+        self.show_query(f'Search: "{query}"', search=query)
 
     def view_individual_student(self):
-        code = simpledialog.askstring("Find Student", "Enter Student Code:")
+        code = simpledialog.askstring("Find Student", "Enter Student Code or Name:")
         if not code: return
         student = self.manager.get_student_by_code(code)
         if not student:
-            messagebox.showerror("Not found", "Student not found!")
+            # Fall back to a name/code search
+            if not self.manager.query(search=code, limit=1).total:
+                messagebox.showerror("Not found", "Student not found!")
+                return
+            self.show_query(f'Search: "{code}"', search=code)
             return
+        self.redisplay = lambda: self.display_students_cards(
+            [s for s in [self.manager.get_student_by_code(code)] if s], title=f"Student: {student.name}")
         self.display_students_cards([student], title=f"Student: {student.name}")
 
     def add_student_dialog(self):
+        if self.busy_loading(): return
         dialog = ctk.CTkToplevel(self.root)
         dialog.title("Add Student")
         dialog.geometry("400x400")
@@ -439,6 +2853,8 @@ class StudentManagerApp:
             entries.append(e)
 
         def submit():
+            # A background reload may have started while the dialog was open
+            if self.busy_loading(): return
             if not all(entries[i].get() for i in [0,1]):
                 messagebox.showerror("Error", "Student Code and Name are required!")
                 return
@@ -450,12 +2866,10 @@ class StudentManagerApp:
                 entries[5].get() or "0"
             )
             if success:
-                if self.manager.save_students():
-                    messagebox.showinfo("Success", message)
-                    dialog.destroy()
-                    self.view_all_students()
-                else:
-                    messagebox.showerror("Error","Failed to save file!")
+                self.io.request_save(self.on_saved)
+                messagebox.showinfo("Success", message)
+                dialog.destroy()
+                self.redisplay()
             else:
                 messagebox.showerror("Error", message)
 
@@ -467,6 +2881,7 @@ class StudentManagerApp:
         ).grid(row=6, column=0, columnspan=2, padx=15, pady=20, sticky="we")
 
     def update_student_dialog(self):
+        if self.busy_loading(): return
         code = simpledialog.askstring("Update Student","Enter Student Code:")
         if not code: return
         student = self.manager.get_student_by_code(code)
@@ -491,6 +2906,7 @@ class StudentManagerApp:
             entries.append(e)
 
         def submit():
+            if self.busy_loading(): return
             success, message = self.manager.update_student(
                 code,
                 name=entries[0].get(),
@@ -500,12 +2916,10 @@ class StudentManagerApp:
                 exam_mark=entries[4].get()
             )
             if success:
-                if self.manager.save_students():
-                    messagebox.showinfo("Success", message)
-                    dialog.destroy()
-                    self.view_all_students()
-                else:
-                    messagebox.showerror("Error","Failed to save file!")
+                self.io.request_save(self.on_saved)
+                messagebox.showinfo("Success", message)
+                dialog.destroy()
+                self.redisplay()
             else:
                 messagebox.showerror("Error", message)
 
@@ -517,6 +2931,7 @@ class StudentManagerApp:
         ).grid(row=5, column=0, columnspan=2, padx=15, pady=20, sticky="we")
 
     def delete_student(self):
+        if self.busy_loading(): return
         code = simpledialog.askstring("Delete Student","Enter Student Code:")
         if not code: return
         student = self.manager.get_student_by_code(code)
@@ -524,41 +2939,53 @@ class StudentManagerApp:
             messagebox.showerror("Not found","Student not found!")
             return
         confirm = messagebox.askyesno("Confirm", f"Delete {student.name}?")
-        if confirm:
+        if confirm and not self.busy_loading():
             success,message = self.manager.delete_student(code)
             if success:
-                if self.manager.save_students():
-                    messagebox.showinfo("Success", message)
-                    self.view_all_students()
-                else:
-                    messagebox.showerror("Error","Failed to save file!")
+                self.io.request_save(self.on_saved)
+                messagebox.showinfo("Success", message)
+                self.redisplay()
             else:
                 messagebox.showerror("Error", message)
 
+    def import_students(self):
+        if self.busy_loading(): return
+        path = filedialog.askopenfilename(
+            title="Import Students",
+            filetypes=[("CSV files", "*.csv"), ("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if not path or self.busy_loading(): return
+        try:
+            added, errors, _ = self.manager.import_csv(path, save=False)
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            messagebox.showerror("Error", f"Could not read file:\n{e}")
+            return
+        if added:
+            self.io.request_save(self.on_saved)
+
+        summary = f"Imported {added} student(s)."
+        if errors:
+            shown = "\n".join(f"Row {number}: {message}" for number, message in errors[:15])
+            more = f"\n...and {len(errors) - 15} more" if len(errors) > 15 else ""
+            summary += f"\n\n{len(errors)} row(s) skipped:\n{shown}{more}"
+            messagebox.showwarning("Import", summary)
+        else:
+            messagebox.showinfo("Import", summary)
+        if added:
+            self.redisplay()
+
     def sort_students(self):
-        choice = simpledialog.askstring("Sort Students","Sort by:\n1 - Name (A-Z)\n2 - Name (Z-A)\n3 - Percentage (High-Low)\n4 - Percentage (Low-High)")
-        students = self.manager.get_all_students()
-        if not students: 
+        choice = simpledialog.askstring("Sort Students","Sort by:\n1 - Name (A-Z)\n2 - Name (Z-A)\n3 - Percentage (High-Low)\n4 - Percentage (Low-High)\n5 - Student Code\n6 - Exam Mark (High-Low)\n7 - Coursework (High-Low)")
+        if not len(self.manager): 
             messagebox.showinfo("Info","No students to sort.")
             return
 
-        if choice=="1": 
-            students.sort(key=lambda x:x.name)
-            title="Sorted by Name (A-Z)"
-        elif choice=="2": 
-            students.sort(key=lambda x:x.name, reverse=True)
-            title="Sorted by Name (Z-A)"
-        elif choice=="3": 
-            students.sort(key=lambda x:x.overall_percentage, reverse=True)
-            title="Sorted by Percentage (High-Low)"
-        elif choice=="4": 
-            students.sort(key=lambda x:x.overall_percentage)
-            title="Sorted by Percentage (Low-High)"
-        else: 
+        if choice not in SORT_ORDERS: 
             messagebox.showerror("Error","Invalid option!")
             return
 
-        self.display_students_cards(students, title=title)
+        column, descending, title = SORT_ORDERS[choice]
+        self.show_query(title, sort=column, descending=descending)
 
     # Theme
     def change_theme(self, new_mode):
@@ -567,10 +2994,14 @@ class StudentManagerApp:
 
 # Main
 
-def main():
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        return cli(argv)
+    load_gui()
     root = ctk.CTk()
     app = StudentManagerApp(root)
     root.mainloop()
 
 if __name__=="__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,362 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+
+import Manager
+
+
+# Synthetic data
+
+FIRST_NAMES = ["John", "Sam", "Lee", "Matt", "Ron", "Jake", "Jo", "Gareth", "Alan", "Les"]
+LAST_NAMES = ["Curry", "Sturtivant", "Scott", "Thompson", "Herrema", "Hobbs", "Hyde", "Southgate", "Shearer", "Ferdinand"]
+
+def generate_cohort(filename, rows, seed=0):
+    # Writes a studentMarks.txt-style file with `rows` random students
+    rng = random.Random(seed)
+    with open(filename, 'w', buffering=1024 * 1024) as file:
+        file.write(f"{rows}\n")
+        for i in range(rows):
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            file.write(f"{100000 + i},{name},{rng.randint(0, 20)},{rng.randint(0, 20)},"
+                       f"{rng.randint(0, 20)},{rng.randint(0, 100)}\n")
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def measure(func, *args, **kwargs):
+    # Like timed() but also returns the peak Python heap allocated during the call
+    tracemalloc.start()
+    try:
+        seconds, result = timed(func, *args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak, result
+
+
+LATENCY_PERCENTILES = (50, 90, 99)
+
+def summarize(samples, count=None):
+    # samples: per-call seconds (or one total for bulk operations);
+    # count: items processed when that differs from the number of calls
+    total = sum(samples)
+    count = len(samples) if count is None else count
+    ordered = sorted(samples)
+    result = {
+        "count": count,
+        "seconds": total,
+        "throughput_per_s": count / total if total else None,
+    }
+    if len(ordered) > 1:
+        for p in LATENCY_PERCENTILES:
+            result[f"p{p}_us"] = ordered[min(len(ordered) - 1, len(ordered) * p // 100)] * 1e6
+        result["min_us"] = ordered[0] * 1e6
+        result["max_us"] = ordered[-1] * 1e6
+    return result
+
+
+def latencies(func, args_list):
+    samples = []
+    clock = time.perf_counter
+    for args in args_list:
+        start = clock()
+        func(*args)
+        samples.append(clock() - start)
+    return summarize(samples)
+
+
+# Text vs SQLite backends
+
+def session(open_manager, code):
+    # One typical edit: open the data, find a student, change a mark, save
+    manager = open_manager()
+    manager.get_student_by_code(code)
+    manager.update_student(code, exam_mark=50)
+    manager.save_students()
+    manager.get_highest_scoring_student()
+    if hasattr(manager, "close"):
+        manager.close()
+
+
+def bench_backends(sizes, workdir):
+    results = []
+    for rows in sizes:
+        text_file = os.path.join(workdir, f"backend_{rows}.txt")
+        db_file = os.path.join(workdir, f"backend_{rows}.db")
+        generate_cohort(text_file, rows)
+        if os.path.exists(db_file):
+            os.remove(db_file)
+        Manager.migrate_text_to_sqlite(text_file, db_file)
+        code = str(100000 + rows // 2)
+
+        text_time, _ = timed(session, lambda: Manager.StudentManager(text_file, journal=True), code)
+        sqlite_time, _ = timed(session, lambda: Manager.open_manager(db_file, backend="sqlite"), code)
+
+        text = Manager.StudentManager(text_file)
+        db = Manager.open_manager(db_file, backend="sqlite")
+        lookups = [str(100000 + i) for i in random.Random(1).sample(range(rows), min(rows, 1000))]
+        text_lookup, _ = timed(lambda: [text.get_student_by_code(c) for c in lookups])
+        sqlite_lookup, _ = timed(lambda: [db.get_student_by_code(c) for c in lookups])
+        db.close()
+
+        results.append({
+            "rows": rows,
+            "text_session_s": text_time,
+            "sqlite_session_s": sqlite_time,
+            "text_lookup_us": text_lookup / len(lookups) * 1e6,
+            "sqlite_lookup_us": sqlite_lookup / len(lookups) * 1e6,
+        })
+    return results
+
+
+def print_backends(results):
+    print(f"{'rows':>10} {'text session':>14} {'sqlite session':>15} {'text lookup':>12} {'sqlite lookup':>14}")
+    for r in results:
+        print(f"{r['rows']:>10} {r['text_session_s']:>13.4f}s {r['sqlite_session_s']:>14.4f}s "
+              f"{r['text_lookup_us']:>10.2f}us {r['sqlite_lookup_us']:>12.2f}us")
+    crossover = next((r["rows"] for r in results if r["sqlite_session_s"] < r["text_session_s"]), None)
+    if crossover is None:
+        print("SQLite was not faster for a one-edit session at any size tested")
+    else:
+        print(f"SQLite is faster for a one-edit session from {crossover} rows")
+
+
+# Full suite: every StudentManager operation at each cohort size
+
+def bench_size(rows, workdir, ops=1000, memory=True, seed=0):
+    filename = os.path.join(workdir, f"suite_{rows}.txt")
+    generate_cohort(filename, rows, seed)
+    rng = random.Random(seed + 1)
+    result = {"rows": rows, "file_bytes": os.path.getsize(filename), "ops": {}}
+    record = result["ops"]
+
+    open_manager = lambda: Manager.StudentManager(filename)
+    if memory:
+        seconds, peak, manager = measure(open_manager)
+        result["peak_memory_bytes"] = peak
+        del manager
+    seconds, manager = timed(open_manager)
+    record["load"] = summarize([seconds], rows)
+
+    sample = min(rows, ops)
+    codes = [str(100000 + i) for i in rng.sample(range(rows), sample)]
+    record["get_student_by_code"] = latencies(manager.get_student_by_code, [(code,) for code in codes])
+    record["get_highest_scoring_student"] = latencies(manager.get_highest_scoring_student, [()] * sample)
+    record["get_lowest_scoring_student"] = latencies(manager.get_lowest_scoring_student, [()] * sample)
+
+    for column, descending, _ in Manager.SORT_ORDERS.values():
+        # First call after an edit builds the view; that is the cost a user sees
+        manager.update_student(codes[0], exam_mark=rng.randint(0, 100))
+        seconds, _ = timed(manager.sorted_students, column, descending)
+        record[f"sort:{column}:{'desc' if descending else 'asc'}"] = summarize([seconds], rows)
+
+    new_codes = [str(100000 + rows + i) for i in range(sample)]
+    record["add_student"] = latencies(manager.add_student, [
+        (code, "Bench Student", rng.randint(0, 20), rng.randint(0, 20), rng.randint(0, 20), rng.randint(0, 100))
+        for code in new_codes])
+    record["update_student"] = latencies(lambda code, mark: manager.update_student(code, exam_mark=mark),
+                                         [(code, rng.randint(0, 100)) for code in codes])
+    record["delete_student"] = latencies(manager.delete_student, [(code,) for code in new_codes])
+
+    seconds, _ = timed(manager.save_students)
+    record["save"] = summarize([seconds], len(manager))
+    os.remove(filename)
+    return result
+
+
+def run_suite(sizes, workdir, ops=1000, memory=True, seed=0, progress=None):
+    results = []
+    for rows in sizes:
+        if progress:
+            progress(rows)
+        results.append(bench_size(rows, workdir, ops, memory, seed))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "numpy": Manager.load_numpy() is not None,
+            "ops": ops,
+            "seed": seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def print_suite(report):
+    for result in report["results"]:
+        peak = result.get("peak_memory_bytes")
+        print(f"\n{result['rows']} rows, {result['file_bytes'] / 1e6:.1f} MB file"
+              + (f", peak load memory {peak / 1e6:.1f} MB" if peak is not None else ""))
+        print(f"  {'operation':<34} {'total':>10} {'per sec':>12} {'p50':>10} {'p99':>10}")
+        for name, op in result["ops"].items():
+            rate = op["throughput_per_s"]
+            line = f"  {name:<34} {op['seconds']:>9.4f}s {rate if rate else 0:>12,.0f}"
+            if "p50_us" in op:
+                line += f" {op['p50_us']:>8.1f}us {op['p99_us']:>8.1f}us"
+            print(line)
+
+
+# Parallel load scaling: one file, loaded with an increasing number of processes
+
+def bench_parallel(rows, worker_counts, workdir, columnar=False):
+    filename = os.path.join(workdir, f"parallel_{rows}.txt")
+    generate_cohort(filename, rows)
+    results = []
+    for workers in worker_counts:
+        seconds, manager = timed(Manager.StudentManager, filename, workers=workers, columnar=columnar)
+        assert len(manager) == rows, manager.last_error
+        del manager
+        results.append({"workers": workers, "seconds": seconds, "rows_per_s": rows / seconds})
+    return {"rows": rows, "columnar": columnar, "cpus": os.cpu_count(), "results": results}
+
+
+def print_parallel(report):
+    base = report["results"][0]["seconds"]
+    print(f"{report['rows']} rows, {report['cpus']} CPUs{', columnar' if report['columnar'] else ''}")
+    print(f"{'workers':>8} {'load':>10} {'rows/s':>12} {'speedup':>8}")
+    for r in report["results"]:
+        print(f"{r['workers']:>8} {r['seconds']:>9.2f}s {r['rows_per_s']:>12,.0f} {base / r['seconds']:>7.2f}x")
+
+
+# Command-line startup: how long a batch script waits per Manager.py call
+
+MANAGER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def bench_startup(workdir, runs=10):
+    filename = os.path.join(workdir, "startup.txt")
+    generate_cohort(filename, 100)
+    manager_py = os.path.join(MANAGER_DIR, "Manager.py")
+    commands = {
+        "python (baseline)": [sys.executable, "-c", "pass"],
+        "import Manager": [sys.executable, "-c", "import Manager"],
+        "Manager.py stats": [sys.executable, manager_py, "--file", filename, "stats"],
+        # -m reuses the cached bytecode; running the file directly recompiles it each time
+        "python -m Manager stats": [sys.executable, "-m", "Manager", "--file", filename, "stats"],
+    }
+    results = {}
+    for name, command in commands.items():
+        samples = []
+        for _ in range(runs):
+            seconds, _ = timed(subprocess.run, command, cwd=MANAGER_DIR, check=True,
+                               stdout=subprocess.DEVNULL, env=dict(os.environ, DISPLAY=""))
+            samples.append(seconds)
+        results[name] = summarize(samples)
+    probe = ("import sys, Manager; print(sorted(m for m in ('tkinter', 'customtkinter', 'numpy', 'PIL') "
+             "if m in sys.modules))")
+    loaded = subprocess.run([sys.executable, "-c", probe], cwd=MANAGER_DIR, check=True,
+                            capture_output=True, text=True).stdout.strip()
+    return {"runs": runs, "commands": results, "heavy_modules_on_import": loaded}
+
+
+def print_startup(report):
+    print(f"{'command':<26} {'median':>10} {'min':>10}")
+    for name, result in report["commands"].items():
+        print(f"{name:<26} {result['p50_us'] / 1000:>8.1f}ms {result['min_us'] / 1000:>8.1f}ms")
+    print(f"GUI/numpy modules loaded by 'import Manager': {report['heavy_modules_on_import']}")
+
+
+# Comparing two saved runs
+
+def compare_reports(base, new, threshold=0.10, min_seconds=0.001):
+    # Returns (rows, operation, metric, base value, new value, ratio, regressed) for
+    # every metric both runs measured. Totals under min_seconds are too noisy to judge.
+    base_results = {r["rows"]: r for r in base["results"]}
+    rows_out = []
+    for result in new["results"]:
+        old = base_results.get(result["rows"])
+        if old is None:
+            continue
+        pairs = []
+        for name, op in result["ops"].items():
+            if name in old["ops"] and max(op["seconds"], old["ops"][name]["seconds"]) >= min_seconds:
+                pairs.append((name, "seconds", old["ops"][name]["seconds"], op["seconds"]))
+        if "peak_memory_bytes" in result and "peak_memory_bytes" in old:
+            pairs.append(("load", "peak_memory_bytes", old["peak_memory_bytes"], result["peak_memory_bytes"]))
+        for name, metric, before, after in pairs:
+            ratio = after / before if before else float("inf")
+            rows_out.append((result["rows"], name, metric, before, after, ratio, ratio > 1 + threshold))
+    return rows_out
+
+
+def print_comparison(rows, threshold):
+    print(f"{'rows':>10} {'operation':<34} {'metric':<18} {'base':>12} {'new':>12} {'change':>8}")
+    for size, name, metric, before, after, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{size:>10} {name:<34} {metric:<18} {before:>12.4g} {after:>12.4g} {(ratio - 1) * 100:>+7.1f}%{flag}")
+    regressions = sum(1 for row in rows if row[-1])
+    print(f"{regressions} regression(s) over {threshold * 100:.0f}%")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Student Manager benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+    backends = sub.add_parser("backends", help="text file vs SQLite crossover")
+    backends.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    suite = sub.add_parser("suite", help="time every operation at each size (up to 10000000 rows)")
+    suite.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    suite.add_argument("--ops", type=int, default=1000, help="calls per latency-timed operation")
+    suite.add_argument("--seed", type=int, default=0)
+    suite.add_argument("--no-memory", dest="memory", action="store_false",
+                       help="skip the traced load used for peak memory (it is slow at 10^7 rows)")
+    suite.add_argument("--output", "-o", help="write the JSON report here instead of a table")
+    parallel = sub.add_parser("parallel", help="load time against number of parser processes")
+    parallel.add_argument("--rows", type=int, default=2000000)
+    parallel.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parallel.add_argument("--columnar", action="store_true")
+    parallel.add_argument("--output", "-o", help="write the JSON report here instead of a table")
+    startup = sub.add_parser("startup", help="command-line start-up time and import cost")
+    startup.add_argument("--runs", type=int, default=10)
+    startup.add_argument("--output", "-o", help="write the JSON report here instead of a table")
+    compare = sub.add_parser("compare", help="flag regressions between two suite reports")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, 0.10 = 10%%")
+    compare.add_argument("--min-seconds", type=float, default=0.001)
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.base) as file:
+            base = json.load(file)
+        with open(args.new) as file:
+            new = json.load(file)
+        rows = compare_reports(base, new, args.threshold, args.min_seconds)
+        return 1 if print_comparison(rows, args.threshold) else 0
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.command == "backends":
+            print_backends(bench_backends(args.sizes, workdir))
+            return 0
+        if args.command == "suite":
+            report = run_suite(args.sizes, workdir, args.ops, args.memory, args.seed,
+                               progress=lambda rows: print(f"benchmarking {rows} rows...", file=sys.stderr))
+        elif args.command == "parallel":
+            report = bench_parallel(args.rows, args.workers, workdir, args.columnar)
+        else:
+            report = bench_startup(workdir, args.runs)
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(report, file, indent=2)
+        elif args.command == "suite":
+            print_suite(report)
+        elif args.command == "parallel":
+            print_parallel(report)
+        elif args.command == "startup":
+            print_startup(report)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,406 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import Manager
+
+
+class ManagerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.workdir, "studentMarks.txt")
+        with open(self.filename, "w") as file:
+            file.write("3\n1,Ann Lee,10,10,10,50\n2,Bob Ray,20,20,20,90\n3,Cat Fox,5,5,5,30\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+
+def write_cohort(filename, count):
+    # count students with marks spread across every grade
+    with open(filename, "w") as file:
+        file.write(f"{count}\n")
+        for i in range(count):
+            file.write(f"{100 + i},Student {i},{i % 21},{i * 7 % 21},{i * 3 % 21},{i * 13 % 101}\n")
+
+
+def file_strings(manager):
+    return [student.to_file_string() for student in manager.get_all_students()]
+
+
+class JournalTests(ManagerTestCase):
+    def test_edits_are_appended_and_replayed(self):
+        with open(self.filename) as file:
+            snapshot = file.read()
+        manager = Manager.StudentManager(self.filename, journal=True)
+        manager.update_student("1", exam_mark=60)
+        manager.delete_student("2")
+        manager.add_student("4", "Dan Moe", 4, 4, 4, 4)
+        self.assertTrue(manager.save_students())
+        with open(self.filename) as file:
+            self.assertEqual(file.read(), snapshot)
+        with open(manager.journal_filename) as file:
+            self.assertEqual(file.read(), "S,1,Ann Lee,10,10,10,60\nD,2\nS,4,Dan Moe,4,4,4,4\n")
+
+        reloaded = Manager.StudentManager(self.filename, journal=True)
+        self.assertEqual(file_strings(reloaded), file_strings(manager))
+
+    def test_journal_is_folded_into_the_snapshot_past_its_limit(self):
+        manager = Manager.StudentManager(self.filename, journal=True, journal_limit=40)
+        manager.update_student("1", exam_mark=60)
+        self.assertTrue(manager.save_students())
+        self.assertTrue(os.path.exists(manager.journal_filename))
+        manager.update_student("2", exam_mark=61)
+        self.assertTrue(manager.save_students())
+        self.assertFalse(os.path.exists(manager.journal_filename))
+        plain = Manager.StudentManager(self.filename)
+        self.assertEqual(plain.get_student_by_code("1").exam_mark, 60)
+        self.assertEqual(plain.get_student_by_code("2").exam_mark, 61)
+
+    def test_compact_writes_pending_edits(self):
+        manager = Manager.StudentManager(self.filename, journal=True)
+        manager.delete_student("3")
+        manager.compact()
+        self.assertFalse(os.path.exists(manager.journal_filename))
+        self.assertEqual(len(Manager.StudentManager(self.filename)), 2)
+
+    def test_edit_after_torn_journal_tail_is_kept(self):
+        manager = Manager.StudentManager(self.filename, journal=True)
+        manager.update_student("3", exam_mark=40)
+        self.assertTrue(manager.save_students())
+        # A crash mid-append leaves a record without its newline
+        with open(manager.journal_filename, "a") as file:
+            file.write("S,3,Cat Fox,3,3")
+
+        manager = Manager.StudentManager(self.filename, journal=True)
+        self.assertEqual(manager.get_student_by_code("3").exam_mark, 40)
+        self.assertTrue(manager.add_student("4", "Dan Moe", 4, 4, 4, 4)[0])
+        self.assertTrue(manager.save_students())
+
+        reloaded = Manager.StudentManager(self.filename, journal=True)
+        self.assertIsNotNone(reloaded.get_student_by_code("4"))
+        self.assertEqual(reloaded.get_student_by_code("3").mark1, 5)
+        with open(manager.journal_filename) as file:
+            self.assertTrue(file.read().endswith("S,4,Dan Moe,4,4,4,4\n"))
+
+    def test_crash_before_journal_removal_keeps_pending_edits(self):
+        manager = Manager.StudentManager(self.filename, journal=True)
+        manager.delete_student("2")
+        self.assertTrue(manager.save_students())
+        manager.add_student("2", "Bob Ray", 1, 2, 3, 4)
+        manager._force_compact = True
+        # The snapshot is renamed into place, then the process dies before the
+        # old journal is removed
+        with mock.patch.object(Manager.os, "remove", side_effect=OSError("crash")):
+            self.assertFalse(manager.save_students())
+
+        reloaded = Manager.StudentManager(self.filename, journal=True)
+        self.assertEqual(reloaded.get_student_by_code("2").exam_mark, 4)
+        self.assertEqual(len(reloaded), 3)
+
+    def test_journaled_save_does_not_rehash_the_snapshot(self):
+        manager = Manager.StudentManager(self.filename, journal=True)
+        manager.update_student("1", exam_mark=60)
+        with mock.patch.object(Manager, "file_state", wraps=Manager.file_state) as state:
+            self.assertTrue(manager.save_students())
+        self.assertEqual([call.args[0] for call in state.call_args_list], [manager.journal_filename])
+        self.assertEqual(manager.read_changes()[0], "unchanged")
+
+    def test_failed_append_is_retried(self):
+        manager = Manager.StudentManager(self.filename, journal=True)
+        manager.update_student("1", exam_mark=70)
+        with mock.patch.object(manager, "_append_journal", side_effect=OSError("disk full")):
+            self.assertFalse(manager.save_students())
+        manager.update_student("2", exam_mark=71)
+        self.assertTrue(manager.save_students())
+
+        reloaded = Manager.StudentManager(self.filename, journal=True)
+        self.assertEqual(reloaded.get_student_by_code("1").exam_mark, 70)
+        self.assertEqual(reloaded.get_student_by_code("2").exam_mark, 71)
+
+
+class ReloadTests(ManagerTestCase):
+    def append(self, text):
+        with open(self.filename, "a") as file:
+            file.write(text)
+
+    def test_unchanged_files_are_not_reread(self):
+        manager = Manager.StudentManager(self.filename, journal=True)
+        self.assertEqual(manager.read_changes()[0], "unchanged")
+        self.assertEqual(manager.reload_students(), 0)
+
+    def test_appended_rows_are_added(self):
+        manager = Manager.StudentManager(self.filename, journal=True)
+        self.append("4,Dan Moe,4,4,4,4\n5,Eve Orr,5,5,5,5\n")
+        self.assertEqual(manager.read_changes()[0], "appended")
+        self.assertEqual(manager.reload_students(), 2)
+        self.assertEqual(len(manager), 5)
+        self.assertEqual(manager.get_student_by_code("5").name, "Eve Orr")
+
+    def test_mid_file_edit_with_append_is_diffed(self):
+        manager = Manager.StudentManager(self.filename, journal=True)
+        with open(self.filename) as file:
+            text = file.read()
+        with open(self.filename, "w") as file:
+            file.write(text.replace("2,Bob Ray,20,20,20,90", "2,Bob Ray,20,20,20,91")
+                       .replace("3,Cat Fox,5,5,5,30\n", "") + "4,Dan Moe,4,4,4,4\n")
+        self.assertEqual(manager.read_changes()[0], "changed")
+        self.assertEqual(manager.reload_students(), 3)
+        self.assertEqual(manager.get_student_by_code("2").exam_mark, 91)
+        self.assertIsNone(manager.get_student_by_code("3"))
+        self.assertIsNotNone(manager.get_student_by_code("4"))
+
+    def test_changed_reload_applies_the_journal(self):
+        manager = Manager.StudentManager(self.filename, journal=True)
+        with open(manager.journal_filename, "w") as file:
+            file.write("D,1\nS,2,Bob Ray,1,1,1,1\n")
+        self.assertEqual(manager.reload_students(), 2)
+        self.assertIsNone(manager.get_student_by_code("1"))
+        self.assertEqual(manager.get_student_by_code("2").mark1, 1)
+
+    def test_edit_made_during_a_reload_is_kept(self):
+        manager = Manager.StudentManager(self.filename, journal=True)
+        with open(self.filename) as file:
+            text = file.read()
+        with open(self.filename, "w") as file:
+            file.write(text.replace("1,Ann Lee,10,10,10,50", "1,Ann Lee,10,10,10,55")
+                       .replace("2,Bob Ray,20,20,20,90", "2,Bob Ray,20,20,20,80"))
+        changes = manager.read_changes()
+        manager.update_student("1", exam_mark=99)
+        manager.delete_student("3")
+        self.assertEqual(manager.install_changes(changes), 1)
+        self.assertEqual(manager.get_student_by_code("1").exam_mark, 99)
+        self.assertEqual(manager.get_student_by_code("2").exam_mark, 80)
+        self.assertIsNone(manager.get_student_by_code("3"))
+        self.assertTrue(manager.save_students())
+
+        reloaded = Manager.StudentManager(self.filename, journal=True)
+        self.assertEqual(reloaded.get_student_by_code("1").exam_mark, 99)
+        self.assertIsNone(reloaded.get_student_by_code("3"))
+
+    def test_bad_row_is_reported_and_picked_up_once_fixed(self):
+        manager = Manager.StudentManager(self.filename)
+        self.append("5,Eve,x,1,1,1\n")
+        kind, _, _, error = manager.read_changes()
+        self.assertEqual(kind, "error")
+        self.assertIsNone(manager.reload_students())
+        self.assertIn("invalid literal", manager.last_error)
+
+        with open(self.filename) as file:
+            text = file.read()
+        with open(self.filename, "w") as file:
+            file.write(text.replace("5,Eve,x", "5,Eve,9"))
+        self.assertEqual(manager.reload_students(), 1)
+        self.assertEqual(manager.get_student_by_code("5").mark1, 9)
+
+
+class BinaryTests(ManagerTestCase):
+    def test_round_trip_and_mapped_lookup(self):
+        with open(self.filename, "a") as file:
+            file.write("4,Dan Moe,-3,1,1,300\n")
+        binary = os.path.join(self.workdir, "students.bin")
+        self.assertEqual(Manager.text_to_binary(self.filename, binary), (4, []))
+        with Manager.BinaryStudentFile(binary) as source:
+            self.assertEqual(len(source), 4)
+            self.assertEqual(source.get_student_by_code("4").to_file_string(), "4,Dan Moe,-3,1,1,300")
+            self.assertIsNone(source.get_student_by_code("5"))
+            self.assertIsNone(source.get_student_by_code("x" * 20))
+
+        text = os.path.join(self.workdir, "back.txt")
+        self.assertEqual(Manager.binary_to_text(binary, text), 4)
+        with open(self.filename) as original, open(text) as copy:
+            self.assertEqual(original.read().replace("3\n", "4\n", 1), copy.read())
+
+    def test_version_1_files_are_still_read(self):
+        binary = os.path.join(self.workdir, "old.bin")
+        record = Manager.BINARY_RECORDS[1]
+        with open(binary, "wb") as file:
+            file.write(Manager.BINARY_HEADER.pack(Manager.BINARY_MAGIC, 1, record.size, 1))
+            file.write(Manager.BINARY_INDEX_ENTRY.pack(b"7".ljust(16, b"\0"), 0))
+            file.write(record.pack(b"7", b"Old Row", 1, 2, 3, 4))
+        manager = Manager.StudentManager(binary)
+        self.assertEqual(manager.get_student_by_code("7").to_file_string(), "7,Old Row,1,2,3,4")
+
+    def test_export_reports_rows_that_do_not_fit(self):
+        with open(self.filename, "a") as file:
+            file.write("4,%s,1,1,1,1\n%s,Eve,1,1,1,1\n" % ("N" * 49, "9" * 17))
+        binary = os.path.join(self.workdir, "out.bin")
+        count, errors = Manager.export_students(Manager.StudentManager(self.filename), binary)
+        self.assertEqual(count, 3)
+        self.assertEqual([row for row, _ in errors], [4, 5])
+        self.assertEqual(len(Manager.StudentManager(binary)), 3)
+
+    def test_failed_write_leaves_no_temp_file(self):
+        binary = os.path.join(self.workdir, "out.bin")
+        with self.assertRaises(ValueError):
+            Manager.write_binary_students(binary, [Manager.Student("1", "Ann", 1, 1, 1, 2 ** 31)])
+        with mock.patch.object(Manager.os, "fsync", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                Manager.write_binary_students(binary, [Manager.Student("1", "Ann", 1, 1, 1, 1)])
+        self.assertEqual(sorted(os.listdir(self.workdir)), ["studentMarks.txt"])
+
+    def test_binary_manager_rejects_long_names(self):
+        manager = Manager.StudentManager(os.path.join(self.workdir, "students.bin"))
+        ok, message = manager.add_student("1", "N" * 49, 1, 1, 1, 1)
+        self.assertFalse(ok)
+        self.assertIn("48 bytes", message)
+
+
+class BackendTests(ManagerTestCase):
+    ROWS = [
+        ["4", "Dan Moe", "4", "4", "4", "4"],
+        ["1", "Ann Again", "1", "1", "1", "1"],
+        ["5", "Eve Orr", "5", "5", "5"],
+        ["", "No Code", "1", "1", "1", "1"],
+        ["6", "Comma, Name", "1", "1", "1", "1"],
+        ["4", "Dan Twice", "4", "4", "4", "4"],
+        ["7", "Bad Mark", "21", "1", "1", "1"],
+        ["8", "Fay Ng", "8", "8", "8", "80"],
+    ]
+
+    def open_both(self):
+        database = os.path.join(self.workdir, "students.db")
+        Manager.migrate_text_to_sqlite(self.filename, database)
+        text = Manager.open_manager(self.filename)
+        sqlite = Manager.open_manager(database)
+        self.addCleanup(sqlite.close)
+        return text, sqlite
+
+    def test_open_manager_picks_the_backend(self):
+        text, sqlite = self.open_both()
+        self.assertIsInstance(text, Manager.StudentManager)
+        self.assertIsInstance(sqlite, Manager.SQLiteStudentManager)
+        with self.assertRaises(ValueError):
+            Manager.open_manager(self.filename, backend="csv")
+
+    def test_bulk_add_matches_across_backends(self):
+        text, sqlite = self.open_both()
+        self.assertEqual(text.bulk_add(self.ROWS), sqlite.bulk_add(self.ROWS))
+        self.assertEqual([student.to_file_string() for student in text.sorted_students("student_code")],
+                         [student.to_file_string() for student in sqlite.sorted_students("student_code")])
+
+    def test_queries_match_across_backends(self):
+        text, sqlite = self.open_both()
+        for arguments in ({"sort": "overall_percentage", "descending": True}, {"search": "ray"},
+                          {"grade": ("A",)}, {"min_percentage": 50, "limit": 1, "offset": 1}):
+            expected, actual = text.query(**arguments), sqlite.query(**arguments)
+            self.assertEqual(expected.total, actual.total, arguments)
+            self.assertEqual([student.student_code for student in expected.students],
+                             [student.student_code for student in actual.students], arguments)
+
+
+class BatchTests(ManagerTestCase):
+    def test_commit_applies_every_update(self):
+        manager = Manager.StudentManager(self.filename)
+        with manager.batch() as batch:
+            batch.update("1", exam_mark=70)
+            batch.update("2", name="Bob Roy", mark1=1)
+        self.assertTrue(batch.committed)
+        reloaded = Manager.StudentManager(self.filename)
+        self.assertEqual(reloaded.get_student_by_code("1").exam_mark, 70)
+        self.assertEqual(reloaded.get_student_by_code("2").to_file_string(), "2,Bob Roy,1,20,20,90")
+
+    def test_one_bad_update_applies_nothing(self):
+        manager = Manager.StudentManager(self.filename)
+        batch = manager.batch()
+        batch.update("1", exam_mark=70)
+        batch.update("2", mark1=21)
+        batch.update("9", mark1=1)
+        self.assertFalse(batch.commit())
+        self.assertEqual([code for code, _ in batch.errors], ["2", "9"])
+        self.assertEqual(manager.get_student_by_code("1").exam_mark, 50)
+
+    def test_exception_in_block_rolls_back(self):
+        manager = Manager.StudentManager(self.filename)
+        with self.assertRaises(RuntimeError):
+            with manager.batch() as batch:
+                batch.update("1", exam_mark=70)
+                raise RuntimeError
+        self.assertEqual(manager.get_student_by_code("1").exam_mark, 50)
+
+    def test_failure_while_applying_restores_every_row(self):
+        manager = Manager.StudentManager(self.filename)
+        before = manager.get_statistics()
+        batch = manager.batch()
+        batch.update("1", exam_mark=70)
+        batch.update("2", exam_mark=71)
+        with mock.patch.object(manager, "_track", side_effect=[None, RuntimeError]):
+            with self.assertRaises(RuntimeError):
+                batch.commit()
+        self.assertEqual(manager.get_student_by_code("1").exam_mark, 50)
+        self.assertEqual(manager.get_student_by_code("2").exam_mark, 90)
+        self.assertEqual(manager.get_statistics(), before)
+
+
+class QueryTests(ManagerTestCase):
+    def setUp(self):
+        super().setUp()
+        write_cohort(self.filename, 60)
+        self.manager = Manager.StudentManager(self.filename)
+
+    def test_pages_cover_the_result_once(self):
+        codes = []
+        offset = 0
+        while offset is not None:
+            page = self.manager.query(sort="overall_percentage", descending=True, offset=offset, limit=25)
+            self.assertEqual(page.total, 60)
+            self.assertEqual(page.pages, 3)
+            codes += [student.student_code for student in page.students]
+            offset = page.next_offset
+        self.assertEqual(page.number, 3)
+        self.assertEqual(len(page.students), 10)
+        self.assertEqual(codes, [student.student_code for student in
+                                 self.manager.sorted_students("overall_percentage", descending=True)])
+
+    def test_filters_and_edits(self):
+        page = self.manager.query(grade=("A",), limit=100)
+        self.assertTrue(page.students)
+        self.assertTrue(all(student.grade == "A" for student in page.students))
+        self.assertEqual(page.total, len(page.students))
+        student = page.students[0]
+        self.manager.update_student(student.student_code, exam_mark=0, mark1=0, mark2=0, mark3=0)
+        self.assertEqual(self.manager.query(grade=("A",), limit=100).total, page.total - 1)
+
+    def test_search_matches_names_and_codes(self):
+        self.assertEqual([s.student_code for s in self.manager.query(search="Student 42").students], ["142"])
+        self.assertEqual([s.name for s in self.manager.query(search="159").students], ["Student 59"])
+
+
+class LoadTests(ManagerTestCase):
+    def setUp(self):
+        super().setUp()
+        write_cohort(self.filename, 3000)
+        with open(self.filename, "a") as file:
+            file.write("100,Duplicate,1,1,1,1\n")
+
+    def test_columnar_matches_objects(self):
+        objects = Manager.StudentManager(self.filename)
+        columnar = Manager.StudentManager(self.filename, columnar=True)
+        self.assertEqual(file_strings(columnar), file_strings(objects))
+        self.assertEqual(columnar.get_statistics(), objects.get_statistics())
+        self.assertEqual(columnar.duplicate_codes, ["100"])
+
+    def test_parallel_matches_serial(self):
+        serial = Manager.StudentManager(self.filename)
+        with mock.patch.object(Manager, "PARALLEL_MIN_BYTES", 0):
+            for columnar in (False, True):
+                parallel = Manager.StudentManager(self.filename, workers=2, columnar=columnar)
+                self.assertIsNone(parallel.last_error)
+                self.assertEqual(file_strings(parallel), file_strings(serial))
+                self.assertEqual(parallel.get_statistics(), serial.get_statistics())
+
+    def test_oversized_header_count_is_capped(self):
+        with open(self.filename) as file:
+            rows = file.read().split("\n", 1)[1]
+        with open(self.filename, "w") as file:
+            file.write("999999999999\n" + rows)
+        self.assertEqual(len(Manager.StudentManager(self.filename)), 3000)
+
+
+if __name__ == "__main__":
+    unittest.main()